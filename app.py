@@ -1,21 +1,33 @@
 """Flask app for sqlutilz query generation and execution."""
 
-from flask import Flask, request, jsonify, Response, g
+from flask import Flask, request, jsonify, Response, stream_with_context
 from sqlutilz.sql_builder import json_select, json_insert, json_update, json_delete, df_sql, create_table
-from sqlutilz.sqlbbw import SqlCon, cast_df
+from sqlutilz.sqlbbw import SqlCon
 import pandas as pd
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Iterator
+import asyncio
 import logging
+import threading
 from config import DB_CONFIG
 
 app = Flask(__name__)
 logger = logging.getLogger(__name__)
 
+_SQLCON = None
+_SQLCON_LOCK = threading.Lock()
+_DF_CONCURRENCY = 16  # max rows in flight per /query/dataframe request; keep <= pool_size + max_overflow
+
 def get_db():
-    """Get or create SqlCon instance in Flask context."""
-    if 'db' not in g:
-        g.db = SqlCon(DB_CONFIG['conn_str'], audit_db=DB_CONFIG.get('audit_db'))
-    return g.db
+    """Get the process-wide SqlCon, creating it (and its pool) on first use."""
+    global _SQLCON
+    if _SQLCON is None:
+        with _SQLCON_LOCK:
+            if _SQLCON is None:
+                _SQLCON = SqlCon(
+                    DB_CONFIG['conn_str'], audit_db=DB_CONFIG.get('audit_db'),
+                    pool_size=10, max_overflow=20, pool_pre_ping=True
+                )
+    return _SQLCON
 
 def validate_payload(payload: Dict[str, Any], required: List[str]) -> Dict[str, Any]:
     """Validate JSON payload and ensure dialect matches SqlCon.db."""
@@ -31,6 +43,36 @@ def validate_payload(payload: Dict[str, Any], required: List[str]) -> Dict[str,
         payload['dialect'] = con.db
     return payload
 
+def _unique_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Keep the last of any repeated column name (e.g. a JOIN selecting a.id, b.id), as row dicts would; to_json rejects repeats."""
+    if df.columns.is_unique:
+        return df
+    return df.loc[:, ~df.columns.duplicated(keep='last')]
+
+def _records_json(df: pd.DataFrame) -> str:
+    """Serialize DataFrame rows to a JSON array without building row dicts."""
+    return _unique_columns(df).to_json(orient='records', date_format='iso')
+
+def _ndjson_chunks(df: pd.DataFrame, chunk_size: int = 1000) -> Iterator[str]:
+    """Yield DataFrame rows as newline-delimited JSON, chunk_size rows at a time."""
+    df = _unique_columns(df)
+    for i in range(0, len(df), chunk_size):
+        yield df.iloc[i:i + chunk_size].to_json(orient='records', lines=True, date_format='iso').rstrip('\n') + '\n'
+
+async def _gather_or_cancel(coros) -> List[str]:
+    """Run coroutines concurrently; on the first failure cancel the rest and re-raise it."""
+    tasks = [asyncio.ensure_future(c) for c in coros]
+    if not tasks:
+        return []
+    done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+    for t in pending:
+        t.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+    for t in tasks:
+        if t in done and t.exception() is not None:
+            raise t.exception()
+    return [t.result() for t in tasks]
+
 @app.errorhandler(ValueError)
 def handle_value_error(e: ValueError) -> Response:
     """Handle ValueError with 400 response."""
@@ -54,7 +96,9 @@ def select_query():
         return jsonify({'sql': sql, 'params': params})
     try:
         df = con.fetch_df(sql, params)
-        return jsonify({'result': df.to_dict(orient='records')})
+        if payload.get('stream', False):
+            return Response(stream_with_context(_ndjson_chunks(df)), mimetype='application/x-ndjson')
+        return Response('{"result":' + _records_json(df) + '}', mimetype='application/json')
     except Exception as e:
         raise ValueError(f'Query execution failed: {e}')
 
@@ -108,14 +152,17 @@ def delete_query():
         raise ValueError(f'Delete execution failed: {e}')
 
 @app.route('/query/dataframe', methods=['POST'])
-def dataframe_query():
+async def dataframe_query():
     """Generate or execute DataFrame-based queries."""
     payload = request.get_json()
     payload = validate_payload(payload, ['data', 'table', 'columns'])
     con = get_db()
     execute = payload.get('execute', False)
-    df = pd.DataFrame(payload['data'])
-    df = cast_df(df)
+    data = payload['data']
+    if isinstance(data, dict):
+        df = pd.DataFrame(data)  # columnar: {col: [values...]}
+    else:
+        df = pd.DataFrame.from_records(data)
     queries = df_sql(
         df,
         table=payload['table'],
@@ -131,19 +178,30 @@ def dataframe_query():
             [{'sql': sql, 'params': params} for sql, params in row_queries]
             for row_queries in queries
         ])
-    try:
-        results = []
-        for row_queries in queries:
+    is_select = 'select' in payload.get('ops', [])
+    sem = asyncio.Semaphore(_DF_CONCURRENCY)
+
+    async def run_row(row_queries) -> str:
+        # Rows run concurrently; statements within a row keep their order
+        async with sem:
             row_results = []
             for sql, params in row_queries:
-                if 'select' in payload.get('ops', []):
-                    df_result = con.fetch_df(sql, params)
-                    row_results.append(df_result.to_dict(orient='records'))
+                if is_select:
+                    df_result = await con.fetch_df_async(sql, params)
+                    row_results.append(_records_json(df_result))
                 else:
-                    con.execute(sql, params)
-                    row_results.append({'status': 'success'})
-            results.append(row_results)
-        return jsonify({'results': results})
+                    await con.execute_async(sql, params)
+                    row_results.append('{"status":"success"}')
+            return '[' + ','.join(row_results) + ']'
+
+    # df_sql emits per-row statements as tuples and trailing bulk-insert chunks as lists;
+    # the chunks may target rows the row statements update, so they start only afterwards
+    row_queries = [q for q in queries if isinstance(q, tuple)]
+    insert_chunks = [q for q in queries if not isinstance(q, tuple)]
+    try:
+        results = await _gather_or_cancel(run_row(q) for q in row_queries)
+        results += await _gather_or_cancel(run_row(q) for q in insert_chunks)
+        return Response('{"results":[' + ','.join(results) + ']}', mimetype='application/json')
     except Exception as e:
         raise ValueError(f'DataFrame query execution failed: {e}')
 
@@ -154,7 +212,7 @@ def create_table_endpoint():
     payload = validate_payload(payload, ['table', 'source'])
     con = get_db()
     execute = payload.get('execute', False)
-    source = pd.DataFrame(payload['source']) if isinstance(payload['source'], list) else payload['source']
+    source = pd.DataFrame.from_records(payload['source']) if isinstance(payload['source'], list) else payload['source']
     sql = create_table(
         name=payload['table'],
         source=source,
@@ -171,11 +229,5 @@ def create_table_endpoint():
     except Exception as e:
         raise ValueError(f'Table creation failed: {e}')
 
-@app.teardown_appcontext
-def close_db(error):
-    """Close SqlCon instance on app context teardown."""
-    if 'db' in g:
-        g.pop('db').engine.dispose()
-
 if __name__ == '__main__':
     app.run(debug=True)
\ No newline at end of file
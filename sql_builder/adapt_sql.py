@@ -1,32 +1,66 @@
 """Dialect-specific SQL and parameter adaptation."""
 
 import re
+import functools
 from typing import Dict, Any, Union, Tuple, List
 
+_PH_RE = re.compile(r':(\w+)')
+_OFFSET_RE = re.compile(r'OFFSET (\d+) ROWS(?: FETCH NEXT (\d+) ROWS ONLY)?', re.I)
+
+def _patch_pg(m: re.Match) -> str:
+    """Rewrite OFFSET/FETCH to PostgreSQL LIMIT/OFFSET."""
+    off, lim = m.group(1), m.group(2)
+    lim_txt = f' LIMIT {lim}' if lim else ''
+    off_txt = f' OFFSET {off}' if off else ''
+    return lim_txt + off_txt
+
+def _patch_mysql(m: re.Match) -> str:
+    """Rewrite OFFSET/FETCH to MySQL/SQLite LIMIT/OFFSET."""
+    off, lim = m.group(1), m.group(2)
+    return f' LIMIT {lim} OFFSET {off}' if lim else f' OFFSET {off}'
+
+def _sql_mssql(sql: str) -> Tuple[str, Tuple[str, ...]]:
+    return _PH_RE.sub(r'@\1', sql), ()
+
+def _sql_postgres(sql: str) -> Tuple[str, Tuple[str, ...]]:
+    return _OFFSET_RE.sub(_patch_pg, _PH_RE.sub(r'%(\1)s', sql)), ()
+
+def _sql_positional(sql: str) -> Tuple[str, Tuple[str, ...]]:
+    """Swap :name for ? and record the names in placeholder order."""
+    return _OFFSET_RE.sub(_patch_mysql, _PH_RE.sub('?', sql)), tuple(_PH_RE.findall(sql))
+
+_SQL_REWRITERS = {
+    'mssql': _sql_mssql,
+    'postgres': _sql_postgres,
+    'postgresql': _sql_postgres,
+    'mysql': _sql_positional,
+    'sqlite': _sql_positional,
+}
+_POSITIONAL = frozenset(('mysql', 'sqlite'))
+
+@functools.lru_cache(maxsize=4096)
+def _rewrite_sql(sql: str, dialect: str) -> Tuple[str, Tuple[str, ...]]:
+    """Rewrite SQL text for dialect; returns (sql, placeholder names for positional dialects)."""
+    return _SQL_REWRITERS[dialect](sql)
+
+def _rewrite_params(params: Union[Dict[str, Any], List[Any]], names: Tuple[str, ...],
+                    dialect: str) -> Union[Dict[str, Any], List[Any]]:
+    """Reorder params into placeholder order for positional dialects."""
+    if dialect not in _POSITIONAL:
+        return params
+    if not isinstance(params, dict):
+        return list(params)
+    try:
+        return [params[n] for n in names]
+    except KeyError as e:
+        raise ValueError(f'Missing parameter: {e.args[0]}')
+
 def adapt_sql(sql: str, params: Dict[str, Any], dialect: str) -> Tuple[str, Union[Dict[str, Any], List[Any]]]:
     """Adapt SQL and parameters for specific dialect."""
     d = dialect.lower()
     if d == 'oracle':
         return sql, params
-    if d == 'mssql':
-        sql = re.sub(r':(\w+)', r'@\1', sql)
-        return sql, params
-    if d in ('postgres', 'postgresql'):
-        sql = re.sub(r':(\w+)', r'%(\1)s', sql)
-        def _patch(m: re.Match):
-            off = m.group(1)
-            lim = m.group(2)
-            lim_txt = f' LIMIT {lim}' if lim else ''
-            off_txt = f' OFFSET {off}' if off else ''
-            return lim_txt + off_txt
-        sql = re.sub(r'OFFSET (\d+) ROWS(?: FETCH NEXT (\d+) ROWS ONLY)?', _patch, sql, flags=re.I)
-        return sql, params
-    if d in ('mysql', 'sqlite'):
-        sql = re.sub(r':(\w+)', '?', sql)
-        def _patch_mysql(m):
-            off = m.group(1)
-            lim = m.group(2)
-            return f' LIMIT {lim} OFFSET {off}' if lim else f' OFFSET {off}'
-        sql = re.sub(r'OFFSET (\d+) ROWS(?: FETCH NEXT (\d+) ROWS ONLY)?', _patch_mysql, sql, flags=re.I)
-        return sql, list(params.values())
-    raise ValueError(f'Unknown dialect: {d}')
\ No newline at end of file
+    if d not in _SQL_REWRITERS:
+        raise ValueError(f'Unknown dialect: {d}')
+    new_sql, names = _rewrite_sql(sql, d)
+    return new_sql, _rewrite_params(params, names, d)
@@ -2,17 +2,32 @@
 
 import re
 import itertools
-from typing import Any, Dict, List, Tuple, Union, Callable
+import functools
+from typing import Any, Dict, List, Optional, Tuple, Union, Callable
 from .mappings import valid_operators
 
+_IDENT_RE = re.compile(r'\w+').fullmatch
+
+# IN lists longer than this bind as one array parameter on PostgreSQL (= ANY / <> ALL)
+pg_array_threshold = 10
+
+def _pg_array_ok(values: List[Any]) -> bool:
+    """True if values bind as a typed numeric or boolean array; strings would bind as text[]."""
+    types = set(map(type, values))
+    return types <= {int, float} or types == {bool}
+
 class Condition:
-    """Represents a single SQL condition (e.g., col = value)."""
+    """Represents a single SQL condition (e.g., col = value).
+
+    Conditions parsed from strings or tuples come from a cache: each call gets its own
+    copy with a fresh parameter name, but the values list is shared, so treat it as immutable.
+    """
     _ids = itertools.count(1)
     __slots__ = ('field', 'op', 'values', '_uid', 'aggregate')
 
     def __init__(self, field: str, op: str, values: List[Any], aggregate: Optional[str] = None):
         """Initialize condition."""
-        if not re.match(r'^[\w]+$', field):
+        if not _IDENT_RE(field):
             raise ValueError(f'Invalid field name: {field}')
         if op.upper() not in valid_operators:
             raise ValueError(f'Invalid operator: {op}')
@@ -24,38 +39,36 @@ class Condition:
 
     def to_sql(self, dialect: str, ph: str, quote_char: str, dt_wrapper: Callable) -> Tuple[str, Dict[str, Any]]:
         """Convert condition to SQL fragment and parameters."""
-        col_str = f'{quote_char}{self.field}{quote_char}'
-        if self.aggregate:
-            col_str = f'{self.aggregate.upper()}({col_str})'
-        params = {}
-        pname_base = f'{self.field}_{self._uid}'
-
-        if self.op in ('IS NULL', 'IS NOT NULL'):
-            return f'{col_str} {self.op}', params
-
-        if self.op == 'BETWEEN':
-            params[f'{pname_base}_min'] = self.values[0]
-            params[f'{pname_base}_max'] = self.values[1]
-            return f'{col_str} BETWEEN {ph}{pname_base}_min AND {ph}{pname_base}_max', params
-
-        if self.op in ('IN', 'NOT IN'):
-            keys = [f'{ph}{pname_base}_{i}' for i in range(len(self.values))]
-            params.update({f'{pname_base}_{i}': v for i, v in enumerate(self.values)})
-            return f'{col_str} {self.op} ({",".join(keys)})', params
+        return _build_emitter(self.op, dialect, ph, quote_char)(self.field, self.values, self._uid, self.aggregate, dt_wrapper)
 
-        if self.op in ('LIKE', 'ILIKE'):
-            params[pname_base] = self.values[0]
-            return f'{col_str} {self.op} {ph}{pname_base}', params
+    def _rebind(self, values: List[Any]) -> 'Condition':
+        """Copy with other values but the same uid, so per-row SQL keeps the same placeholder names."""
+        c = object.__new__(Condition)
+        c.field, c.op, c.values, c.aggregate, c._uid = self.field, self.op, values, self.aggregate, self._uid
+        return c
 
-        if self.op in ('=', '!=', '<>', '<', '>', '<=', '>='):
-            params[pname_base] = self.values[0]
-            return f'{col_str} {self.op} {dt_wrapper(f"{ph}{pname_base}", self.op, self.values[0])}', params
-
-        raise ValueError(f'Unsupported operator: {self.op}')
+    def _fresh(self) -> 'Condition':
+        """Copy of a cached condition with its own uid, so repeated conditions bind separate params."""
+        c = object.__new__(Condition)
+        c.field, c.op, c.values, c.aggregate = self.field, self.op, self.values, self.aggregate
+        c._uid = next(self._ids)
+        return c
 
     @classmethod
     def from_input(cls, item: Any) -> 'Condition':
-        """Create condition from various input types."""
+        """Create condition from various input types; strings and hashable tuples reuse a cached parse."""
+        if isinstance(item, str):
+            return cls.from_strings([item])[0]
+        if isinstance(item, tuple):
+            try:
+                return _from_input_cached(item, _type_key(item))._fresh()
+            except TypeError:  # tuple holding unhashable values, e.g. a list
+                pass
+        return cls._from_input(item)
+
+    @classmethod
+    def _from_input(cls, item: Any) -> 'Condition':
+        """Build condition from input without caching."""
         if isinstance(item, dict):
             aggregate = item.get('aggregate')
             return cls(item['field'], item['operator'], item.get('value', []), aggregate=aggregate)
@@ -73,7 +86,39 @@ class Condition:
     @classmethod
     def from_string(cls, text: str) -> 'Condition':
         """Parse condition from string (e.g., 'age > 30')."""
-        tokens = _tokenize(text)
+        return cls._from_tokens(_tokenize(text), text)
+
+    @classmethod
+    def from_strings(cls, texts: List[str]) -> List['Condition']:
+        """Parse several condition strings; cached texts reuse their parse, the rest share one tokenizer pass."""
+        if not texts:
+            return []
+        out = [_str_cache.get(t) for t in texts]
+        todo = list(dict.fromkeys(t for t, c in zip(texts, out) if c is None))
+        if todo:
+            parsed = dict(zip(todo, cls._parse_strings(todo)))
+            if len(_str_cache) + len(parsed) > _STR_CACHE_SIZE:
+                _str_cache.clear()
+            _str_cache.update(parsed)
+            out = [parsed[t] if c is None else c for t, c in zip(texts, out)]
+        return [c._fresh() for c in out]
+
+    @classmethod
+    def _parse_strings(cls, texts: List[str]) -> List['Condition']:
+        """Parse several condition strings with a single tokenizer pass."""
+        groups = [[]]
+        for tok in _tokenize(_SPLIT.join(texts)):
+            if tok[0] == 'SPLIT':
+                groups.append([])
+            else:
+                groups[-1].append(tok)
+        if len(groups) != len(texts):
+            raise ValueError('Condition text must not contain the \\x01 separator')
+        return [cls._from_tokens(toks, text) for toks, text in zip(groups, texts)]
+
+    @classmethod
+    def _from_tokens(cls, tokens: List[Tuple[str, str]], text: str) -> 'Condition':
+        """Build condition from the token list of one condition string."""
         if not tokens:
             raise ValueError('Empty condition')
         kind, value = tokens[0]
@@ -107,28 +152,79 @@ class Condition:
         if op_kind in ('IN', 'NOT_IN'):
             if not rest or rest[0][0] != 'LP' or rest[-1][0] != 'RP':
                 raise ValueError(f'{op_kind} requires (values)')
-            vals = []
-            i = 1
-            while i < len(rest) - 1:
-                tk, tv = rest[i]
-                if tk in ('STRING', 'NUMBER'):
-                    vals.append(_coerce(tv))
-                i += 1
+            vals = _coerce_many(rest[1:-1])
             return cls(field, op_value.upper(), vals)
         if op_kind == 'NOT' and rest and rest[0][0] == 'IN':
             rest = rest[1:]
             if not rest or rest[0][0] != 'LP' or rest[-1][0] != 'RP':
                 raise ValueError('NOT IN requires (values)')
-            vals = []
-            i = 1
-            while i < len(rest) - 1:
-                tk, tv = rest[i]
-                if tk in ('STRING', 'NUMBER'):
-                    vals.append(_coerce(tv))
-                i += 1
+            vals = _coerce_many(rest[1:-1])
             return cls(field, 'NOT IN', vals)
         raise ValueError(f'Cannot parse condition: {text}')
 
+# Condition.from_strings cache {text: Condition}; cleared wholesale when it would exceed the size
+_STR_CACHE_SIZE = 1024
+_str_cache: Dict[str, Condition] = {}
+
+def _type_key(item: Any) -> Any:
+    """Types of item and, for tuples, of everything nested in it."""
+    return tuple(map(_type_key, item)) if isinstance(item, tuple) else type(item)
+
+@functools.lru_cache(maxsize=1024)
+def _from_input_cached(item: Tuple[Any, ...], types: Tuple[Any, ...]) -> Condition:
+    """Memoized Condition._from_input for tuples; callers hand out _fresh() copies.
+
+    ``types`` (from _type_key) keeps 1, 1.0 and True from colliding on one cache entry, at any depth.
+    """
+    return Condition._from_input(item)
+
+@functools.lru_cache(maxsize=64)
+def _build_emitter(op: str, dialect: str, ph: str, quote_char: str) -> Callable:
+    """Return a to_sql body specialized for one (op, dialect, ph, quote_char), so calls skip op dispatch."""
+    q = quote_char
+
+    def col(field: str, aggregate: Optional[str]) -> str:
+        return f'{aggregate.upper()}({q}{field}{q})' if aggregate else f'{q}{field}{q}'
+
+    if op in ('IS NULL', 'IS NOT NULL'):
+        suffix = ' ' + op
+        def emit(field, values, uid, aggregate, dt_wrapper):
+            return col(field, aggregate) + suffix, {}
+    elif op == 'BETWEEN':
+        def emit(field, values, uid, aggregate, dt_wrapper):
+            base = f'{field}_{uid}'
+            return (f'{col(field, aggregate)} BETWEEN {ph}{base}_min AND {ph}{base}_max',
+                    {f'{base}_min': values[0], f'{base}_max': values[1]})
+    elif op in ('IN', 'NOT IN'):
+        pg = dialect in ('postgres', 'postgresql')
+        any_op = '= ANY' if op == 'IN' else '<> ALL'
+        infix = f' {op} ('
+        def emit(field, values, uid, aggregate, dt_wrapper):
+            base = f'{field}_{uid}'
+            if pg and len(values) > pg_array_threshold and _pg_array_ok(values):
+                return f'{col(field, aggregate)} {any_op}({ph}{base})', {base: list(values)}
+            params = {}
+            keys = []
+            prefix = base + '_'
+            for i, v in enumerate(values):
+                k = prefix + str(i)
+                keys.append(ph + k)
+                params[k] = v
+            return col(field, aggregate) + infix + ','.join(keys) + ')', params
+    elif op in ('LIKE', 'ILIKE'):
+        infix = f' {op} {ph}'
+        def emit(field, values, uid, aggregate, dt_wrapper):
+            base = f'{field}_{uid}'
+            return col(field, aggregate) + infix + base, {base: values[0]}
+    elif op in ('=', '!=', '<>', '<', '>', '<=', '>='):
+        infix = f' {op} '
+        def emit(field, values, uid, aggregate, dt_wrapper):
+            base = f'{field}_{uid}'
+            return col(field, aggregate) + infix + dt_wrapper(ph + base, op, values[0]), {base: values[0]}
+    else:
+        raise ValueError(f'Unsupported operator: {op}')
+    return emit
+
 def _coerce(val: str) -> Union[int, float, bool, str]:
     """Coerce string to appropriate type."""
     val = val.strip()
@@ -144,35 +240,53 @@ def _coerce(val: str) -> Union[int, float, bool, str]:
         except ValueError:
             return val
 
+def _coerce_many(tokens: List[Tuple[str, str]]) -> List[Union[int, float, bool, str]]:
+    """Coerce the STRING/NUMBER tokens of an IN list, skipping the generic path for numbers."""
+    out = []
+    append = out.append
+    for kind, val in tokens:
+        if kind == 'NUMBER':
+            # NUMBER tokens are already \d+(\.\d+)?, so only the 0/1 boolean quirk needs checking
+            if val == '1' or val == '0':
+                append(val == '1')
+            else:
+                append(float(val) if '.' in val else int(val))
+        elif kind == 'STRING':
+            append(_coerce(val))
+    return out
+
+_SPLIT = '\x01'  # separator between conditions batched through from_strings
+
+_TOKEN_SPEC = [
+    (r'\s+', None),
+    (r'\x01', 'SPLIT'),
+    (r'\bIS NOT NULL\b', 'IS_NOT_NULL'),
+    (r'\bIS NULL\b', 'IS_NULL'),
+    (r'\bNOT IN\b', 'NOT_IN'),
+    (r'\bNOT\b', 'NOT'),
+    (r'\bBETWEEN\b', 'BETWEEN'),
+    (r'\bIN\b', 'IN'),
+    (r'\bILIKE\b', 'ILIKE'),
+    (r'\bLIKE\b', 'LIKE'),
+    (r'!=|<>|<=|>=|>|<|=', 'COMP_OP'),
+    (r'\(', 'LP'),
+    (r'\)', 'RP'),
+    (r"'(?:[^']|'')*'", 'STRING'),
+    (r'\d+(?:\.\d+)?', 'NUMBER'),
+    (r'\bAND\b', 'AND'),
+    (r'\bOR\b', 'OR'),
+    (r'[A-Za-z_]\w*', 'IDENT'),
+    (r',', 'COMMA'),
+]
+_TOKEN_RE = re.compile('|'.join(f'(?P<{name or "WHITESPACE"}>{pat})' for pat, name in _TOKEN_SPEC), re.IGNORECASE)
+
 def _tokenize(text: str) -> List[Tuple[str, str]]:
     """Tokenize SQL condition string."""
-    token_spec = [
-        (r'\s+', None),
-        (r'\bIS NOT NULL\b', 'IS_NOT_NULL'),
-        (r'\bIS NULL\b', 'IS_NULL'),
-        (r'\bNOT IN\b', 'NOT_IN'),
-        (r'\bNOT\b', 'NOT'),
-        (r'\bBETWEEN\b', 'BETWEEN'),
-        (r'\bIN\b', 'IN'),
-        (r'\bILIKE\b', 'ILIKE'),
-        (r'\bLIKE\b', 'LIKE'),
-        (r'!=|<>|<=|>=|>|<|=', 'COMP_OP'),
-        (r'\(', 'LP'),
-        (r'\)', 'RP'),
-        (r"'(?:[^']|'')*'", 'STRING'),
-        (r'\d+(?:\.\d+)?', 'NUMBER'),
-        (r'\bAND\b', 'AND'),
-        (r'\bOR\b', 'OR'),
-        (r'[A-Za-z_]\w*', 'IDENT'),
-        (r',', 'COMMA'),
-    ]
-    master_re = re.compile('|'.join(f'(?P<{name or "WHITESPACE"}>{pat})' for pat, name in token_spec), re.IGNORECASE)
     pos = 0
     out = []
-    while pos < len(text):
-        m = master_re.match(text, pos)
-        if not m:
-            raise SyntaxError(f'Unexpected char at {pos}: {text[pos:pos+10]}')
+    for m in _TOKEN_RE.finditer(text):
+        if m.start() != pos:
+            break
         pos = m.end()
         kind = m.lastgroup
         if kind is None or kind == 'WHITESPACE':
@@ -181,4 +295,6 @@ def _tokenize(text: str) -> List[Tuple[str, str]]:
         if kind == 'STRING':
             value = value[1:-1].replace("''", "'")
         out.append((kind, value))
+    if pos != len(text):
+        raise SyntaxError(f'Unexpected char at {pos}: {text[pos:pos+10]}')
     return out
\ No newline at end of file
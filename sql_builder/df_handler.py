@@ -2,50 +2,66 @@
 
 import pandas as pd
 import re
-from typing import List, Tuple, Union, Dict, Any
-from .query_builder import SQLBuilder
+from typing import List, Tuple, Union, Dict, Any, Optional
+from .query_builder import _builder
+from .conditions import Condition
 from .corrector import cast_df
 
+_IDENT_RE = re.compile(r'\w+').fullmatch
+_COL_OP_RE = re.compile(r'(\w+)\s*(.*)\?')
+
 def df_sql(df: pd.DataFrame, table: str, columns: List[Union[str, Tuple[str, str]]], *, expression: Optional[str] = None,
            dialect: str = 'default', pk: Optional[List[str]] = None, use_upsert: bool = False,
-           ops: List[str] = ['select', 'update', 'insert', 'delete']) -> List[Tuple[Tuple[str, Union[Dict[str, Any], List[Any]]]]]:
+           ops: List[str] = ['select', 'update', 'insert', 'delete'], chunk_size: int = 1000) -> List[Tuple[Tuple[str, Union[Dict[str, Any], List[Any]]]]]:
     """Generate SQL queries from DataFrame."""
     if not isinstance(df, pd.DataFrame):
         raise TypeError('Input must be a pandas DataFrame')
     if df.empty:
         return []
-    df = cast_df(df)  # Coerce types using sqlbbw.py's DataCorrector
-    builder = SQLBuilder(dialect)
+    builder = _builder(dialect)
     out = []
     proj, cond_tpls = [], []
     for c in columns:
         if isinstance(c, tuple):
             col, op = c
-            if not re.match(r'^[\w]+$', col):
+            if not _IDENT_RE(col):
                 raise ValueError(f'Invalid column name: {col}')
             cond_tpls.append((col, op.lower()))
             proj.append(col)
         elif '?' in str(c):
-            m = re.match(r'(\w+)\s*(.*)\?', c)
+            m = _COL_OP_RE.match(c)
             if m:
                 col, op = m.groups()
-                if not re.match(r'^[\w]+$', col):
+                if not _IDENT_RE(col):
                     raise ValueError(f'Invalid column name: {col}')
                 cond_tpls.append((col.strip(), op.strip() or '='))
                 proj.append(col.strip())
         else:
-            if not re.match(r'^[\w]+$', c):
+            if not _IDENT_RE(c):
                 raise ValueError(f'Invalid column name: {c}')
             proj.append(c)
+    proj = list(dict.fromkeys(proj))
+    # upsert/insert rows also carry pk columns left out of `columns`, so ON CONFLICT targets a bound column
+    write_cols = proj + [k for k in pk or [] if k not in proj] if use_upsert else proj
+    cols_set = set(df.columns)
+    if not cols_set.issuperset(write_cols):
+        raise ValueError(f'Columns not in DataFrame: {[c for c in write_cols if c not in cols_set]}')
+    df = cast_df(df[write_cols].copy())  # Coerce only the referenced columns
     if 'insert' in ops and not use_upsert:
-        data_list = df[proj].to_dict('records')
-        sql, params = builder.insert_bulk(table, data_list)
-        out.append([(sql, params)])
+        arrays = [df[c].to_numpy(dtype=object) for c in proj]
+        for i in range(0, len(df), chunk_size):
+            out.append([builder.insert_bulk_columns(table, proj, [a[i:i + chunk_size] for a in arrays])])
     else:
-        for row in df.itertuples(index=False):
-            r = dict(zip(df.columns, row))
-            conds = [f'{c} {op} "{r[c]}"' if op.lower() == 'like' else f'{c} {op} {r[c]}' for c, op in cond_tpls]
-            data = {k: r[k] for k in proj if k in r}
+        col_names = list(df.columns)
+        col_arr = df.to_numpy(dtype=object)
+        write_idx = [col_names.index(c) for c in write_cols]
+        # one Condition per column, rebound per row, so every row's SQL text (and placeholders) is identical
+        cond_base = [(c, Condition(c, op.upper(), [None])) for c, op in cond_tpls]
+        insert_data = []
+        for row in col_arr:
+            r = {col_names[i]: row[i] for i in write_idx}
+            data = r if write_cols is proj else {k: r[k] for k in proj}
+            conds = [base._rebind([r[c]]) for c, base in cond_base]  # bound params, never inlined
             row_ops = []
             if 'select' in ops:
                 sql, params = builder.select(table, proj, conds, expression)
@@ -58,10 +74,11 @@ def df_sql(df: pd.DataFrame, table: str, columns: List[Union[str, Tuple[str, str
                     sql, params = builder.update(table, data, conds, expression)
                     row_ops.append((sql, params))
                 if 'insert' in ops:
-                    sql, params = builder.insert(table, r)
-                    row_ops.append((sql, params))
+                    insert_data.append(r)
             if 'delete' in ops:
                 sql, params = builder.delete(table, conds, expression)
                 row_ops.append((sql, params))
             out.append(tuple(row_ops))
+        for i in range(0, len(insert_data), chunk_size):
+            out.append([builder.insert_bulk(table, insert_data[i:i + chunk_size])])
     return out
\ No newline at end of file
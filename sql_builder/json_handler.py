@@ -1,12 +1,12 @@
 """JSON payload handling for SQL queries."""
 
 from typing import Dict, List, Tuple, Any
-from .query_builder import SQLBuilder
+from .query_builder import _builder
 from .adapt_sql import adapt_sql
 
 def json_select(payload: Dict[str, Any], dialect: str = 'default') -> Tuple[str, Any]:
     """Generate SELECT query from JSON payload."""
-    builder = SQLBuilder(dialect)  # Use provided dialect (should be SqlCon.db)
+    builder = _builder(dialect)  # Use provided dialect (should be SqlCon.db)
     required = ['table']
     missing = [k for k in required if k not in payload]
     if missing:
@@ -29,19 +29,25 @@ def json_select(payload: Dict[str, Any], dialect: str = 'default') -> Tuple[str,
     )
     return adapt_sql(sql, params, dialect)
 
-def json_insert(rows: List[Dict[str, Any]], dialect: str = 'default', multi_row: bool = True) -> List[Tuple[str, Any]]:
-    """Generate INSERT queries from JSON payload."""
+def json_insert(rows: List[Dict[str, Any]], dialect: str = 'default', multi_row: bool = True,
+                chunk_size: int = 1000) -> List[Tuple[str, Any]]:
+    """Generate INSERT queries from JSON payload, one bulk INSERT per (table, columns) chunk."""
     if not rows:
         raise ValueError('No rows provided for insert')
-    builder = SQLBuilder(dialect)  # Use provided dialect (should be SqlCon.db)
-    same_table = len(set(r['table'] for r in rows)) == 1
-    if multi_row and same_table:
-        table = rows[0]['table']
-        data_list = [r['insertValues'] for r in rows]
-        sql, params = builder.insert_bulk(table, data_list)
-        return [adapt_sql(sql, params, dialect)]
-    else:
+    builder = _builder(dialect)  # Use provided dialect (should be SqlCon.db)
+    if not multi_row:
         return [adapt_sql(*builder.insert(r['table'], r['insertValues']), dialect) for r in rows]
+    # insert_bulk takes its columns from the first row, so only rows with the same keys can share one
+    groups = {}  # {(table, keys): [insertValues]}, keeps first-seen order for FK parents
+    for r in rows:
+        values = r['insertValues']
+        groups.setdefault((r['table'], tuple(values)), []).append(values)
+    out = []
+    for (table, _), data_list in groups.items():
+        for i in range(0, len(data_list), chunk_size):
+            sql, params = builder.insert_bulk(table, data_list[i:i + chunk_size])
+            out.append(adapt_sql(sql, params, dialect))
+    return out
 
 def json_update(payload: Dict[str, Any], dialect: str = 'default') -> Tuple[str, Any]:
     """Generate UPDATE query from JSON payload."""
@@ -49,7 +55,7 @@ def json_update(payload: Dict[str, Any], dialect: str = 'default') -> Tuple[str,
     missing = [k for k in required if k not in payload]
     if missing:
         raise ValueError(f'Missing required fields: {missing}')
-    builder = SQLBuilder(dialect)  # Use provided dialect (should be SqlCon.db)
+    builder = _builder(dialect)  # Use provided dialect (should be SqlCon.db)
     if 'limit' in payload:
         raise NotImplementedError('LIMIT in UPDATE not supported')
     sql, params = builder.update(
@@ -66,7 +72,7 @@ def json_delete(payload: Dict[str, Any], dialect: str = 'default') -> Tuple[str,
     missing = [k for k in required if k not in payload]
     if missing:
         raise ValueError(f'Missing required fields: {missing}')
-    builder = SQLBuilder(dialect)  # Use provided dialect (should be SqlCon.db)
+    builder = _builder(dialect)  # Use provided dialect (should be SqlCon.db)
     sql, params = builder.delete(
         table=payload['table'],
         conditions=payload.get('condition'),
@@ -1,6 +1,9 @@
 """SQL query builder for CRUD operations across multiple dialects."""
 
 import re
+import functools
+import itertools
+import operator
 from typing import Any, Dict, List, Optional, Tuple, Union
 import logging
 from .conditions import Condition
@@ -8,6 +11,32 @@ from .mappings import placeholders, quote_chars
 
 logger = logging.getLogger(__name__)
 
+_IDENT_RE = re.compile(r'\w+').fullmatch
+_DT_RE = re.compile(r'^\d{4}-\d{2}-\d{2}(?: \d{2}:\d{2}:\d{2})?$')
+_DT_OPS = frozenset(('=', '!=', '<', '>', '<=', '>='))
+_DT_WRAP = {
+    'oracle': "TO_DATE({}, 'YYYY-MM-DD HH24:MI:SS')",
+    'mssql': 'CAST({} AS DATETIME2)',
+}
+_EXPR_TOK_RE = re.compile(r'\b\d+\b')
+_EXPR_VALID_RE = re.compile(r'^[\d\sANDOR()]+$')
+
+def _valid_ident(name: str) -> bool:
+    """Same policy as _IDENT_RE; ASCII names take the C-level isidentifier fast path, the rest (e.g. leading digits) the regex."""
+    return (str.isascii(name) and name.isidentifier()) or _IDENT_RE(name) is not None
+
+@functools.lru_cache(maxsize=4096)
+def _quote_ident(qc: str, name: str) -> str:
+    """Quote an identifier; memoized since the same table/column names recur across queries."""
+    return f'{qc}{name}{qc}'
+
+# Statement skeletons; {qc} is filled once per builder, the doubled fields per call
+_SELECT_TMPL = 'SELECT {{cols}} FROM {qc}{{table}}{qc}'
+_INSERT_TMPL = 'INSERT INTO {qc}{{table}}{qc} ({{cols}}) VALUES {{rows}}'
+_INSERT_ALL_TMPL = 'INTO {qc}{{table}}{qc} ({{cols}}) VALUES {{row}}'
+_UPDATE_TMPL = 'UPDATE {qc}{{table}}{qc} SET {{sets}}'
+_DELETE_TMPL = 'DELETE FROM {qc}{{table}}{qc}'
+
 class SQLBuilder:
     """Builds SQL queries for SELECT, INSERT, UPDATE, DELETE, UPSERT."""
     def __init__(self, dialect: str = "default"):
@@ -15,16 +44,31 @@ class SQLBuilder:
         self.dialect = dialect.lower()
         self.ph = placeholders.get(self.dialect, ':')
         self.quote_char = quote_chars.get(self.dialect, '"')
+        # Dialect traits resolved once so query methods test plain booleans
+        self._pg = self.dialect in {'postgres', 'postgresql'}
+        self._positional = self.dialect in {'mysql', 'sqlite'}
+        self._insert_all = self.dialect == 'oracle'
+        self._merge = self.dialect in {'mssql', 'oracle'}
+        self._offset_rows = self.dialect in {'mssql', 'oracle'}
+        self._pg_style_limit = self._pg or self.dialect == 'sqlite'
+        self._quote = functools.partial(_quote_ident, self.quote_char)
+        qc = self.quote_char
+        self._select_render = _SELECT_TMPL.format(qc=qc).format
+        self._insert_render = (_INSERT_ALL_TMPL if self._insert_all else _INSERT_TMPL).format(qc=qc).format
+        self._update_render = _UPDATE_TMPL.format(qc=qc).format
+        self._delete_render = _DELETE_TMPL.format(qc=qc).format
         self._wrap_dt = self._get_dt_wrapper()
 
     def _get_dt_wrapper(self):
-        """Get function to wrap datetime parameters."""
+        """Get function to wrap datetime parameters; a passthrough for dialects that need no cast."""
+        wrap_tmpl = _DT_WRAP.get(self.dialect)
+        if wrap_tmpl is None:
+            return lambda ph_val, op, val: ph_val
+        head, tail = wrap_tmpl.split('{}')
+        dt_match = _DT_RE.match
         def wrap(ph_val, op, val):
-            if op in ('=', '!=', '<', '>', '<=', '>=') and isinstance(val, str) and re.match(r'^\d{4}-\d{2}-\d{2}(?: \d{2}:\d{2}:\d{2})?$', val):
-                if self.dialect == 'oracle':
-                    return f"TO_DATE({ph_val}, 'YYYY-MM-DD HH24:MI:SS')"
-                if self.dialect == 'mssql':
-                    return f"CAST({ph_val} AS DATETIME2)"
+            if op in _DT_OPS and isinstance(val, str) and dt_match(val):
+                return head + ph_val + tail
             return ph_val
         return wrap
 
@@ -32,7 +76,11 @@ class SQLBuilder:
         """Build WHERE clause from conditions."""
         if not conditions:
             return '', {}
-        objs = [Condition.from_input(c) for c in (conditions if isinstance(conditions, list) else [conditions])]
+        if expression is not None and not _EXPR_VALID_RE.match(expression):
+            raise ValueError(f'Invalid characters in expression: {expression}')
+        items = conditions if isinstance(conditions, list) else [conditions]
+        parsed = iter(Condition.from_strings([c for c in items if isinstance(c, str)]))
+        objs = [next(parsed) if isinstance(c, str) else Condition.from_input(c) for c in items]
         sql_parts = []
         params = {}
         for c in objs:
@@ -42,14 +90,14 @@ class SQLBuilder:
         if expression is None:
             where_sql = ' AND '.join(sql_parts)
         else:
+            n = len(sql_parts)
+            part = sql_parts.__getitem__
             def repl(m):
                 idx = int(m.group(0)) - 1
-                if idx < 0 or idx >= len(sql_parts):
+                if not 0 <= idx < n:
                     raise ValueError(f'Invalid index in expression: {m.group(0)}')
-                return sql_parts[idx]
-            where_sql = re.sub(r'\b\d+\b', repl, expression)
-            if not re.match(r'^[\d\sANDOR()]+$', expression):
-                raise ValueError(f'Invalid characters in expression: {expression}')
+                return part(idx)
+            where_sql = _EXPR_TOK_RE.sub(repl, expression)
         return where_sql, params
 
     def select(self, table: str, columns: Union[str, List[str]] = '*', conditions: Optional[List[Any]] = None,
@@ -57,157 +105,189 @@ class SQLBuilder:
                limit: Optional[int] = None, offset: Optional[int] = None, group_by: Optional[List[str]] = None,
                having: Optional[List[Any]] = None, having_expr: Optional[str] = None) -> Tuple[str, Dict[str, Any]]:
         """Generate SELECT query."""
-        if not re.match(r'^[\w]+$', table):
+        if not _valid_ident(table):
             raise ValueError(f'Invalid table name: {table}')
-        cols = ', '.join([f'{self.quote_char}{c}{self.quote_char}' for c in columns]) if isinstance(columns, list) else columns
-        sql = f'SELECT {cols} FROM {self.quote_char}{table}{self.quote_char}'
+        cols = ', '.join([self._quote(c) for c in columns]) if isinstance(columns, list) else columns
+        parts = [self._select_render(cols=cols, table=table)]
         params = {}
         if conditions:
             w_sql, w_params = self.build_where(conditions, expression)
             if w_sql:
-                sql += f' WHERE {w_sql}'
+                parts.append(f'WHERE {w_sql}')
                 params.update(w_params)
         if group_by:
-            if not all(re.match(r'^[\w]+$', g) for g in group_by):
+            if not all(_valid_ident(g) for g in group_by):
                 raise ValueError(f'Invalid group_by columns: {group_by}')
-            sql += f' GROUP BY {", ".join([f"{self.quote_char}{g}{self.quote_char}" for g in group_by])}'
+            parts.append(f'GROUP BY {", ".join([self._quote(g) for g in group_by])}')
             if having:
                 h_sql, h_params = self.build_where(having, having_expr)
                 if h_sql:
-                    sql += f' HAVING {h_sql}'
+                    parts.append(f'HAVING {h_sql}')
                     params.update(h_params)
         if order_by:
-            if not all(re.match(r'^[\w]+$', f) and d.upper() in ('ASC', 'DESC') for f, d in order_by):
+            if not all(_valid_ident(f) and d.upper() in ('ASC', 'DESC') for f, d in order_by):
                 raise ValueError(f'Invalid order_by: {order_by}')
-            sql += f' ORDER BY {", ".join([f"{self.quote_char}{f}{self.quote_char} {d.upper()}" for f, d in order_by])}'
+            parts.append(f'ORDER BY {", ".join([f"{self._quote(f)} {d.upper()}" for f, d in order_by])}')
         if offset is not None or limit is not None:
-            if self.dialect in ('postgres', 'sqlite'):
-                sql += f' OFFSET {offset or 0}'
-                if limit is not None:
-                    sql += f' LIMIT {limit}'
-            elif self.dialect == 'oracle':
-                sql += f' OFFSET {offset or 0} ROWS'
+            if self._pg_style_limit:
+                parts.append(f'OFFSET {offset or 0}')
                 if limit is not None:
-                    sql += f' FETCH NEXT {limit} ROWS ONLY'
-            elif self.dialect == 'mssql':
-                sql += f' OFFSET {offset or 0} ROWS'
+                    parts.append(f'LIMIT {limit}')
+            elif self._offset_rows:
+                parts.append(f'OFFSET {offset or 0} ROWS')
                 if limit is not None:
-                    sql += f' FETCH NEXT {limit} ROWS ONLY'
+                    parts.append(f'FETCH NEXT {limit} ROWS ONLY')
             elif self.dialect == 'mysql':
                 if limit is not None:
-                    sql += f' LIMIT {limit}'
+                    parts.append(f'LIMIT {limit}')
                 if offset:
-                    sql += f' OFFSET {offset}'
-        return sql, params
+                    parts.append(f'OFFSET {offset}')
+        return ' '.join(parts), params
 
     def insert(self, table: str, data: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
         """Generate INSERT query for a single row."""
         return self.insert_bulk(table, [data])
 
+    def _insert_sql(self, table: str, keys: List[str], n_rows: int) -> str:
+        """Render a multi-row INSERT with {col}_{row} placeholders, or bare ? for positional dialects."""
+        cols_sql = ", ".join([self._quote(k) for k in keys])
+        if self._positional:
+            ph_rows = ['(' + ', '.join(['?'] * len(keys)) + ')'] * n_rows
+        else:
+            row_tmpl = '(' + ', '.join([f'{self.ph}{k}_{{0}}' for k in keys]) + ')'
+            ph_rows = [row_tmpl.format(idx) for idx in range(n_rows)]
+        render = self._insert_render
+        if self._insert_all:
+            return 'INSERT ALL\n' + ' '.join([render(table=table, cols=cols_sql, row=r) for r in ph_rows]) + '\nSELECT * FROM DUAL'
+        return render(table=table, cols=cols_sql, rows=", ".join(ph_rows))
+
     def insert_bulk(self, table: str, rows: List[Dict[str, Any]]) -> Tuple[str, Union[Dict[str, Any], List[Any]]]:
         """Generate INSERT query for multiple rows."""
         if not rows:
             raise ValueError('No rows provided for insert')
-        if not re.match(r'^[\w]+$', table):
+        if not _valid_ident(table):
             raise ValueError(f'Invalid table name: {table}')
         keys = list(rows[0].keys())
-        if not all(re.match(r'^[\w]+$', k) for k in keys):
+        if not all(_valid_ident(k) for k in keys):
             raise ValueError(f'Invalid column names: {keys}')
-        params = {}
-        if self.dialect in ('oracle', 'mssql'):
-            into_lines = []
-            for idx, row in enumerate(rows):
-                phs = []
-                for k in keys:
-                    pname = f'{k}_{idx}'
-                    params[pname] = row.get(k)
-                    phs.append(f'{self.ph}{pname}')
-                into_lines.append(f'INTO {self.quote_char}{table}{self.quote_char} ({", ".join([f"{self.quote_char}{k}{self.quote_char}" for k in keys])}) VALUES ({", ".join(phs)})')
-            sql = 'INSERT ALL\n' + ' '.join(into_lines) + '\nSELECT * FROM DUAL' if self.dialect == 'oracle' else 'INSERT INTO'
-        else:
-            ph_rows = []
-            for idx, row in enumerate(rows):
-                phs = []
-                for k in keys:
-                    pname = f'{k}_{idx}'
-                    params[pname] = row.get(k)
-                    phs.append(f'{self.ph}{pname}')
-                ph_rows.append(f'({", ".join(phs)})')
-            sql = f'INSERT INTO {self.quote_char}{table}{self.quote_char} ({", ".join([f"{self.quote_char}{k}{self.quote_char}" for k in keys])}) VALUES {", ".join(ph_rows)}'
-        if self.dialect in ('mysql', 'sqlite'):
-            return sql, list(params.values())
-        return sql, params
+        if self._positional:
+            return self._insert_bulk_positional(table, keys, rows)
+        return self._insert_bulk_named(table, keys, rows)
+
+    def _insert_bulk_named(self, table: str, keys: List[str], rows: List[Dict[str, Any]]) -> Tuple[str, Dict[str, Any]]:
+        """Bulk INSERT with {col}_{row} named params."""
+        sql = self._insert_sql(table, keys, len(rows))
+        suffixes = [f'_{idx}' for idx in range(len(rows))]
+        return sql, {k + sfx: row.get(k) for sfx, row in zip(suffixes, rows) for k in keys}
+
+    def _insert_bulk_positional(self, table: str, keys: List[str], rows: List[Dict[str, Any]]) -> Tuple[str, List[Any]]:
+        """Bulk INSERT with a flat row-major params list; no names are built."""
+        sql = self._insert_sql(table, keys, len(rows))
+        if len(keys) == 1:
+            return sql, list(map(operator.methodcaller('get', keys[0]), rows))
+        try:
+            return sql, list(itertools.chain.from_iterable(map(operator.itemgetter(*keys), rows)))
+        except KeyError:  # ragged rows; missing keys bind NULL
+            return sql, [row.get(k) for row in rows for k in keys]
+
+    def insert_bulk_columns(self, table: str, cols: List[str], arrays: List[Any]) -> Tuple[str, Union[Dict[str, Any], List[Any]]]:
+        """Generate multi-row INSERT from column arrays (one per col) without building row dicts."""
+        if not _valid_ident(table):
+            raise ValueError(f'Invalid table name: {table}')
+        if not all(_valid_ident(k) for k in cols):
+            raise ValueError(f'Invalid column names: {cols}')
+        if len(cols) != len(arrays):
+            raise ValueError(f'Expected {len(cols)} column arrays, got {len(arrays)}')
+        values = [a.tolist() if hasattr(a, 'tolist') else list(a) for a in arrays]
+        n_rows = len(values[0]) if values else 0
+        if not n_rows:
+            raise ValueError('No rows provided for insert')
+        sql = self._insert_sql(table, cols, n_rows)
+        if self._positional:
+            return sql, [v for row in zip(*values) for v in row]
+        return sql, {f'{k}_{idx}': v for k, vals in zip(cols, values) for idx, v in enumerate(vals)}
 
     def update(self, table: str, data: Dict[str, Any], conditions: Optional[List[Any]] = None,
                expression: Optional[str] = None, allow_full: bool = False) -> Tuple[str, Union[Dict[str, Any], List[Any]]]:
         """Generate UPDATE query."""
-        if not re.match(r'^[\w]+$', table):
+        if not _valid_ident(table):
             raise ValueError(f'Invalid table name: {table}')
         sets = []
         params = {}
         for k, v in data.items():
-            if not re.match(r'^[\w]+$', k):
+            if not _valid_ident(k):
                 raise ValueError(f'Invalid column name: {k}')
             pname = f'set_{k}'
-            sets.append(f'{self.quote_char}{k}{self.quote_char} = {self.ph}{pname}')
+            sets.append(f'{self._quote(k)} = {self.ph}{pname}')
             params[pname] = v
-        sql = f'UPDATE {self.quote_char}{table}{self.quote_char} SET {", ".join(sets)}'
+        parts = [self._update_render(table=table, sets=", ".join(sets))]
         if conditions:
             w_sql, w_params = self.build_where(conditions, expression)
             if w_sql:
-                sql += f' WHERE {w_sql}'
+                parts.append(f'WHERE {w_sql}')
                 params.update(w_params)
         elif not allow_full:
             raise ValueError('UPDATE without WHERE refused; use allow_full=True if intended')
-        if self.dialect in ('mysql', 'sqlite'):
+        sql = ' '.join(parts)
+        if self._positional:
             return sql, list(params.values())
         return sql, params
 
     def delete(self, table: str, conditions: Optional[List[Any]] = None,
                expression: Optional[str] = None, allow_full: bool = False) -> Tuple[str, Union[Dict[str, Any], List[Any]]]:
         """Generate DELETE query."""
-        if not re.match(r'^[\w]+$', table):
+        if not _valid_ident(table):
             raise ValueError(f'Invalid table name: {table}')
-        sql = f'DELETE FROM {self.quote_char}{table}{self.quote_char}'
+        parts = [self._delete_render(table=table)]
         params = {}
         if conditions:
             w_sql, w_params = self.build_where(conditions, expression)
             if w_sql:
-                sql += f' WHERE {w_sql}'
+                parts.append(f'WHERE {w_sql}')
                 params.update(w_params)
         elif not allow_full:
             raise ValueError('DELETE without WHERE refused; use allow_full=True if intended')
-        if self.dialect in ('mysql', 'sqlite'):
+        sql = ' '.join(parts)
+        if self._positional:
             return sql, list(params.values())
         return sql, params
 
     def upsert(self, table: str, data: Dict[str, Any], pk: List[str]) -> Tuple[str, Union[Dict[str, Any], List[Any]]]:
         """Generate UPSERT query."""
-        if not re.match(r'^[\w]+$', table):
+        if not _valid_ident(table):
             raise ValueError(f'Invalid table name: {table}')
         cols = list(data.keys())
-        if not all(re.match(r'^[\w]+$', c) for c in cols + pk):
+        if not all(_valid_ident(c) for c in cols + pk):
             raise ValueError(f'Invalid column names: {cols + pk}')
         logger.warning('Ensure pk columns %s are unique in table %s', pk, table)
-        vals = [f'{self.ph}{c}' for c in cols]
         non_pk = [c for c in cols if c not in pk]
         params = data.copy()
-        if self.dialect == 'postgres':
-            updates = [f'{self.quote_char}{c}{self.quote_char}=EXCLUDED.{self.quote_char}{c}{self.quote_char}' for c in non_pk]
-            sql = f'INSERT INTO {self.quote_char}{table}{self.quote_char} ({", ".join([f"{self.quote_char}{c}{self.quote_char}" for c in cols])}) VALUES ({", ".join(vals)}) ON CONFLICT ({", ".join([f"{self.quote_char}{k}{self.quote_char}" for k in pk])}) DO UPDATE SET {", ".join(updates)}'
+        qcol = {c: self._quote(c) for c in cols + pk}
+        qt = self._quote(table)
+        cols_sql = ', '.join([qcol[c] for c in cols])
+        pk_sql = ', '.join([qcol[k] for k in pk])
+        vals_sql = ', '.join([f'{self.ph}{c}' for c in cols])
+        if self._pg:
+            updates = ', '.join([f'{qcol[c]}=EXCLUDED.{qcol[c]}' for c in non_pk])
+            sql = f'INSERT INTO {qt} ({cols_sql}) VALUES ({vals_sql}) ON CONFLICT ({pk_sql}) DO UPDATE SET {updates}'
         elif self.dialect == 'sqlite':
-            updates = [f'{self.quote_char}{c}{self.quote_char}=excluded.{self.quote_char}{c}{self.quote_char}' for c in non_pk]
-            sql = f'INSERT INTO {self.quote_char}{table}{self.quote_char} ({", ".join([f"{self.quote_char}{c}{self.quote_char}" for c in cols])}) VALUES ({", ".join(vals)}) ON CONFLICT ({", ".join([f"{self.quote_char}{k}{self.quote_char}" for k in pk])}) DO UPDATE SET {", ".join(updates)}'
+            updates = ', '.join([f'{qcol[c]}=excluded.{qcol[c]}' for c in non_pk])
+            sql = f'INSERT INTO {qt} ({cols_sql}) VALUES ({vals_sql}) ON CONFLICT ({pk_sql}) DO UPDATE SET {updates}'
         elif self.dialect == 'mysql':
-            updates = [f'{self.quote_char}{c}{self.quote_char}=VALUES({self.quote_char}{c}{self.quote_char})' for c in non_pk]
-            sql = f'INSERT INTO {self.quote_char}{table}{self.quote_char} ({", ".join([f"{self.quote_char}{c}{self.quote_char}" for c in cols])}) VALUES ({", ".join(vals)}) ON DUPLICATE KEY UPDATE {", ".join(updates)}'
-        elif self.dialect in ('mssql', 'oracle'):
-            join_cond = ' AND '.join(f'T.{self.quote_char}{k}{self.quote_char}=S.{self.quote_char}{k}{self.quote_char}' for k in pk)
-            upd = ', '.join(f'T.{self.quote_char}{c}{self.quote_char}=S.{self.quote_char}{c}{self.quote_char}' for c in non_pk)
-            vals_clause = ', '.join(f'{self.ph}{c}' for c in cols)
-            sql = f'MERGE INTO {self.quote_char}{table}{self.quote_char} T USING (VALUES ({vals_clause})) S ({", ".join([f"{self.quote_char}{c}{self.quote_char}" for c in cols])}) ON ({join_cond}) WHEN MATCHED THEN UPDATE SET {upd} WHEN NOT MATCHED THEN INSERT ({", ".join([f"{self.quote_char}{c}{self.quote_char}" for c in cols])}) VALUES ({", ".join([f"S.{self.quote_char}{c}{self.quote_char}" for c in cols])})'
+            updates = ', '.join([f'{qcol[c]}=VALUES({qcol[c]})' for c in non_pk])
+            sql = f'INSERT INTO {qt} ({cols_sql}) VALUES ({vals_sql}) ON DUPLICATE KEY UPDATE {updates}'
+        elif self._merge:
+            join_cond = ' AND '.join([f'T.{qcol[k]}=S.{qcol[k]}' for k in pk])
+            upd = ', '.join([f'T.{qcol[c]}=S.{qcol[c]}' for c in non_pk])
+            src_sql = ', '.join([f'S.{qcol[c]}' for c in cols])
+            sql = f'MERGE INTO {qt} T USING (VALUES ({vals_sql})) S ({cols_sql}) ON ({join_cond}) WHEN MATCHED THEN UPDATE SET {upd} WHEN NOT MATCHED THEN INSERT ({cols_sql}) VALUES ({src_sql})'
         else:
             raise ValueError(f'Upsert not supported for dialect: {self.dialect}')
-        if self.dialect in ('mysql', 'sqlite'):
+        if self._positional:
             return sql, list(params.values())
-        return sql, params
\ No newline at end of file
+        return sql, params
+
+@functools.lru_cache(maxsize=16)
+def _builder(dialect: str) -> SQLBuilder:
+    """Return a shared SQLBuilder per dialect (builders hold no per-query state)."""
+    return SQLBuilder(dialect)
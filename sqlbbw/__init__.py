@@ -2,11 +2,11 @@ from .conn import SqlCon
 from .corrector import DataCorrector, cast_df
 from .audit import Audit, audited, retry
 from .fallback import FallbackExecutor
-from .utils import create_table_schema, map_alter_filter_column, map_alter_forced, insert_batch, upsert
+from .utils import create_table_schema, map_alter_filter_column, map_alter_forced, map_alter_columns, insert_batch, insert_batch_from_df, upsert
 from .mappings import dtype_map, coercers, patterns
 
 __all__ = [
     'SqlCon', 'DataCorrector', 'cast_df', 'Audit', 'audited', 'retry',
     'FallbackExecutor', 'create_table_schema', 'map_alter_filter_column',
-    'map_alter_forced', 'insert_batch', 'upsert', 'dtype_map', 'coercers', 'patterns'
+    'map_alter_forced', 'map_alter_columns', 'insert_batch', 'insert_batch_from_df', 'upsert', 'dtype_map', 'coercers', 'patterns'
 ]
\ No newline at end of file
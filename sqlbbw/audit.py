@@ -4,23 +4,42 @@ import sqlite3
 import logging
 import time
 import functools
-import inspect
+import sys
+import queue
+import threading
+import atexit
 from threading import Lock
 from typing import Optional
+from sqlalchemy.exc import OperationalError, InterfaceError
 
 logger = logging.getLogger(__name__)
 
+_STOP = object()  # queue sentinel that tells the writer thread to exit
+
 class Audit:
-    """Manages audit logging to an SQLite database."""
-    def __init__(self, db: str = 'audit.db'):
+    """Manages audit logging to an SQLite database.
+
+    log() only enqueues; a background writer drains the queue in batches over one
+    persistent WAL-mode connection, so callers never wait on a commit.
+    """
+    def __init__(self, db: str = 'audit.db', batch_size: int = 500):
         self.db = db
+        self.batch_size = batch_size
         self.lock = Lock()
+        self.conn = sqlite3.connect(self.db, check_same_thread=False, isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
         self._init()
+        self.q = queue.Queue()
+        self._closed = False
+        self._writer = threading.Thread(target=self._drain, name='audit-writer', daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
 
     def _init(self):
         """Initialize audit table."""
-        with self.lock, sqlite3.connect(self.db) as conn:
-            conn.execute('''
+        with self.lock:
+            self.conn.execute('''
                 CREATE TABLE IF NOT EXISTS audit (
                     id INTEGER PRIMARY KEY,
                     ts TEXT DEFAULT CURRENT_TIMESTAMP,
@@ -35,36 +54,77 @@ class Audit:
             ''')
 
     def log(self, fn: str, sql: str, params: str, ok: bool, err: Optional[str], caller_module: str, caller_path: str):
-        """Log an operation to the audit table."""
-        with self.lock, sqlite3.connect(self.db) as conn:
-            conn.execute('''
-                INSERT INTO audit (fn, sql, params, ok, err, caller_module, caller_path)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (fn, sql, params, int(ok), err, caller_module, caller_path))
+        """Queue an operation for the audit table."""
+        self.q.put((fn, sql, params, int(ok), err, caller_module, caller_path))
+
+    def _drain(self):
+        """Writer loop: block for one entry, then batch whatever else is queued."""
+        while True:
+            item = self.q.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            stop = False
+            while len(batch) < self.batch_size:
+                try:
+                    item = self.q.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+            self._write(batch)
+            if stop:
+                return
+
+    def _write(self, batch):
+        """Insert a batch of audit rows in one transaction."""
+        try:
+            with self.lock:
+                self.conn.execute('BEGIN')
+                self.conn.executemany('''
+                    INSERT INTO audit (fn, sql, params, ok, err, caller_module, caller_path)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', batch)
+                self.conn.execute('COMMIT')
+        except sqlite3.Error as e:
+            logger.warning(f'Audit write failed for {len(batch)} rows: {e}')
+            if self.conn.in_transaction:
+                self.conn.execute('ROLLBACK')
+
+    def close(self):
+        """Flush queued entries and close the audit connection."""
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)  # the registration would otherwise keep this Audit alive until exit
+        self.q.put(_STOP)
+        self._writer.join()
+        self.conn.close()
 
 def audited(fn):
     """Decorator to audit function calls."""
     @functools.wraps(fn)
     def wrapper(self, *args, **kwargs):
+        if not getattr(self, 'audit', False):
+            return fn(self, *args, **kwargs)
         sql = args[0] if args else kwargs.get('sql', kwargs.get('q', ''))
         params = str(args[1] if len(args) > 1 else kwargs.get('p', {}))[:1000]  # Limit size
         try:
-            frame = inspect.stack()[1]
-            module = inspect.getmodule(frame[0])
-            caller_module = module.__name__ if module else '__main__'
-            caller_path = frame.filename
+            frame = sys._getframe(1)
+            caller_module = frame.f_globals.get('__name__', '__main__')
+            caller_path = frame.f_code.co_filename
         except Exception as e:
             caller_module = 'unknown'
             caller_path = 'unknown'
             logger.warning(f"Failed to extract caller info: {e}")
         try:
             result = fn(self, *args, **kwargs)
-            if self.audit:
-                self.audit_obj.log(fn.__name__, sql, params, True, None, caller_module, caller_path)
+            self.audit_obj.log(fn.__name__, sql, params, True, None, caller_module, caller_path)
             return result
         except Exception as e:
-            if self.audit:
-                self.audit_obj.log(fn.__name__, sql, params, False, str(e), caller_module, caller_path)
+            self.audit_obj.log(fn.__name__, sql, params, False, str(e), caller_module, caller_path)
             raise
     return wrapper
 
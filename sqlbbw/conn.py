@@ -2,26 +2,41 @@
 
 import pandas as pd
 import json
+import re
+import asyncio
+import collections
+import functools
+import time
+import threading
+from contextlib import contextmanager
 from typing import Dict, List, Any, Optional, Union
 from sqlalchemy import create_engine, text, inspect as sa_inspect
 from sqlalchemy.engine import Engine, Connection
 from sqlalchemy.exc import OperationalError, InterfaceError
 from sqlalchemy.engine.url import make_url
 from sqlalchemy.pool import QueuePool
+from sqlalchemy.util import LRUCache
 from .corrector import DataCorrector, cast_df
 from .fallback import FallbackExecutor
 from .audit import Audit, audited, retry
-from .utils import create_table_schema, map_alter_filter_column, map_alter_forced, insert_batch, upsert
+from .utils import create_table_schema, map_alter_columns, insert_batch_from_df, upsert
 import logging
 
 logger = logging.getLogger(__name__)
 
+@functools.lru_cache(maxsize=2048)
+def _cached_text(sql: str):
+    """Memoized text(); parameterized SQL has fixed text, so hot statements skip re-parsing."""
+    return text(sql)
+
+_is_ddl = re.compile(r'\s*(?:CREATE|ALTER|DROP|RENAME)\b', re.IGNORECASE).match
+
 class SqlCon(FallbackExecutor):
     """SQL connection wrapper with data correction and auditing."""
     def __init__(
         self, conn: str, pool_size: int = 5, pool_timeout: int = 30,
         echo: bool = False, debug: bool = False, auto_fb: bool = True,
-        audit_db: str = 'audit.db'
+        audit_db: str = 'audit.db', max_overflow: int = 10, pool_pre_ping: bool = False
     ):
         self.url = make_url(conn)
         super().__init__(self.url)
@@ -30,13 +45,23 @@ class SqlCon(FallbackExecutor):
         self.audit = True
         self.audit_obj = Audit(audit_db)
         self.engine = create_engine(
-            conn, poolclass=QueuePool, pool_size=pool_size,
-            pool_timeout=pool_timeout, pool_recycle=3600, echo=echo, future=True
+            conn, poolclass=QueuePool, pool_size=pool_size, max_overflow=max_overflow,
+            pool_timeout=pool_timeout, pool_recycle=3600, pool_pre_ping=pool_pre_ping,
+            echo=echo, future=True
         )
         self.db = self.db if self.db != 'postgres' else 'postgresql'
         self.corrector = DataCorrector(self.engine, self.db)
         with self.engine.connect():
             pass
+        self._inspector = sa_inspect(self.engine)
+        self._table_names = None
+        self._table_names_ts = 0.0
+        self._col_cache = {}  # {table: (read time, get_columns result)}
+        self._schema_lock = threading.Lock()
+        self._compiled_cache = LRUCache(500)
+        self._sql_counts = collections.Counter()
+        self._sql_counts_lock = threading.Lock()
+        self._hot_threshold = 50
         
     def _get_dialect(self) -> str:
         """Get database dialect from connection string."""
@@ -49,14 +74,25 @@ class SqlCon(FallbackExecutor):
             logger.debug(f'SQL: {sql} | Params: {params}')
 
     @contextmanager
-    def connect(self):
-        """Context-managed connection."""
+    def connect(self, stream: bool = False):
+        """Context-managed connection; stream=True uses server-side cursors where the dialect has them."""
         conn = self.engine.connect()
+        if stream and self.engine.dialect.supports_server_side_cursors:
+            conn = conn.execution_options(stream_results=True)
         try:
             yield conn
         finally:
             conn.close()
 
+    def _is_hot(self, sql: str) -> bool:
+        """Count executions of sql; True once it reaches the hot threshold."""
+        counts = self._sql_counts
+        with self._sql_counts_lock:  # execute also runs on execute_async worker threads
+            if len(counts) > 10000 and sql not in counts:  # one-off SQL text would grow the counter unbounded
+                counts.clear()
+            counts[sql] += 1
+            return counts[sql] >= self._hot_threshold
+
     @retry()
     @audited
     def execute(self, sql: str, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
@@ -65,44 +101,80 @@ class SqlCon(FallbackExecutor):
         self._log(sql, params)
         try:
             with self.engine.begin() as conn:
-                result = conn.execute(text(sql), params)
-                return [dict(row) for row in result.mappings().all()] if result.returns_rows else []
+                if self._is_hot(sql):
+                    conn = conn.execution_options(compiled_cache=self._compiled_cache)
+                result = conn.execute(_cached_text(sql), params)
+                rows = [dict(row) for row in result.mappings().all()] if result.returns_rows else []
+        except (OperationalError, InterfaceError) as e:
+            if not self.auto_fb:
+                raise
+            logger.warning(f'Fallback execution: {e}')
+            rows = self.execute_raw(sql, params)
+        if _is_ddl(sql):
+            self.invalidate_schema()  # caller-issued DDL must not leave the schema snapshot stale
+        return rows
+
+    @retry()
+    @audited
+    def execute_ddl(self, sql: str, stmts: Optional[List[str]] = None):
+        """Run DDL statements in one transaction; sql is what gets logged and audited, stmts default to [sql].
+
+        Unlike execute, this leaves the schema cache alone; callers invalidate the tables they touched.
+        """
+        stmts = stmts or [sql]
+        self._log(sql, {})
+        try:
+            with self.engine.begin() as conn:
+                for stmt in stmts:
+                    conn.execute(text(stmt))
         except (OperationalError, InterfaceError) as e:
             if self.auto_fb:
-                logger.warning(f'Fallback execution: {e}')
-                return self.execute_raw(sql, params)
-            raise
+                logger.warning(f'Fallback DDL: {e}')
+                with self.transaction() as tx:
+                    for stmt in stmts:
+                        tx.execute(stmt)
+            else:
+                raise
+
+    async def execute_async(self, sql: str, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Run execute in a worker thread so callers can overlap statements on pooled connections."""
+        return await asyncio.to_thread(self.execute, sql, params)
+
+    async def fetch_df_async(self, sql: str, params: Optional[Dict[str, Any]] = None, chunksize: Optional[int] = None) -> pd.DataFrame:
+        """Run fetch_df in a worker thread so callers can overlap queries on pooled connections."""
+        return await asyncio.to_thread(self.fetch_df, sql, params, chunksize)
 
-    def append(self, table: str, data: Union[pd.DataFrame, List[Dict[str, Any]]], if_exists: str = 'append', repair: bool = True):
+    def append(self, table: str, data: Union[pd.DataFrame, List[Dict[str, Any]]], if_exists: str = 'append',
+               repair: bool = True, _tables: Optional[set] = None):
         """Append DataFrame or dicts to table."""
         if isinstance(data, pd.DataFrame):
             df = self.corrector.fix_df(table, data)
         else:
             df = pd.DataFrame(data)
             df = self.corrector.fix_df(table, df)
-        tables = self.inspect_db()
+        tables = _tables if _tables is not None else set(self._get_table_names())
         if table not in tables:
             create_table_schema(self, table, df)
+            tables.add(table)
         elif if_exists == 'replace':
             self.execute(f"DROP TABLE IF EXISTS {table}")
+            self.invalidate_schema(table)
             create_table_schema(self, table, df)
-        rows = df.to_dict('records')
         try:
-            insert_batch(self, table, rows)
+            insert_batch_from_df(self, table, df)
         except Exception as e:
             if repair:
                 logger.warning(f"Schema mismatch: {e}. Attempting repair.")
-                schema_map = self.corrector.reverse_map(table)
+                db_types = self.corrector.cols(table)
+                alters = {}
                 for col, dtype in df.dtypes.items():
-                    pd_dtype = str(dtype).lower()
-                    sql_type = self.corrector.cols(table).get(col)
-                    expected_sql = self.corrector.dtype_to_sql(pd_dtype)
+                    sql_type = db_types.get(col)
+                    expected_sql = self.corrector.dtype_to_sql(str(dtype).lower())
                     if sql_type and sql_type != expected_sql:
-                        if 'filter' in if_exists.lower():
-                            map_alter_filter_column(self, table, col, expected_sql)
-                        else:
-                            map_alter_forced(self, table, col, expected_sql)
-                self.append(table, df, if_exists=if_exists, repair=False)
+                        alters[col] = expected_sql
+                map_alter_columns(self, table, alters, forced='filter' not in if_exists.lower())
+                # table now exists and is already replaced, so retry as a plain append
+                self.append(table, df, if_exists='append', repair=False, _tables=tables)
             else:
                 raise
 
@@ -120,25 +192,62 @@ class SqlCon(FallbackExecutor):
         df = self.corrector.fix_df(name, df)
         df.to_sql(name, self.engine, **kwargs)
 
-    def fetch_df(self, sql: str, params: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
-        """Fetch query results as DataFrame."""
+    def fetch_df(self, sql: str, params: Optional[Dict[str, Any]] = None, chunksize: Optional[int] = None) -> pd.DataFrame:
+        """Fetch query results as DataFrame; chunksize streams the result and concatenates the chunks."""
         try:
-            with self.connect() as conn:
-                return pd.read_sql(text(sql), conn, params=params or {})
+            with self.connect(stream=chunksize is not None) as conn:
+                if chunksize is None:
+                    return pd.read_sql(_cached_text(sql), conn, params=params or {})
+                chunks = list(pd.read_sql(_cached_text(sql), conn, params=params or {}, chunksize=chunksize))
+                return pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
         except (OperationalError, InterfaceError) as e:
             if self.auto_fb:
                 logger.warning(f'Fallback fetch: {e}')
                 return pd.DataFrame(self.execute_raw(sql, params or {}))
             raise
 
+    def _get_table_names(self, ttl: float = 30) -> List[str]:
+        """Return table names, re-reading them at most once per ttl seconds."""
+        with self._schema_lock:
+            now = time.time()
+            if self._table_names is None or now - self._table_names_ts > ttl:
+                self._inspector.info_cache.clear()
+                self._table_names = self._inspector.get_table_names()
+                self._table_names_ts = now
+            return self._table_names
+
+    def _get_columns(self, table: str, ttl: float = 30) -> List[Dict[str, Any]]:
+        """Return get_columns(table), cached per table and re-read at most once per ttl seconds."""
+        with self._schema_lock:
+            now = time.time()
+            cached = self._col_cache.get(table)
+            if cached is None or now - cached[0] > ttl:
+                self._inspector.info_cache.clear()
+                cached = self._col_cache[table] = (now, self._inspector.get_columns(table))
+            return cached[1]
+
+    def _get_schema(self, ttl: float = 30) -> Dict[str, List[Dict[str, Any]]]:
+        """Return {table: get_columns(table)}; only tables missing from the cache are read."""
+        return {t: self._get_columns(t, ttl) for t in self._get_table_names(ttl)}
+
+    def invalidate_schema(self, table: Optional[str] = None):
+        """Drop cached metadata for table, or for every table; call after DDL."""
+        with self._schema_lock:
+            self._table_names = None
+            if table is None:
+                self._col_cache.clear()
+            else:
+                self._col_cache.pop(table, None)
+        self.corrector.invalidate(table)
+
     def inspect_db(self) -> Dict[str, List[str]]:
         """Inspect database tables and columns."""
-        inspector = sa_inspect(self.engine)
-        return {t: [c['name'] for c in inspector.get_columns(t)] for t in inspector.get_table_names()}
+        return {t: [c['name'] for c in cols] for t, cols in self._get_schema().items()}
 
     def validate_schema(self, table: str, df: pd.DataFrame, schema_map: Optional[Dict[str, str]] = None) -> Dict:
         """Validate table schema against DataFrame."""
-        db_cols = {c['name']: str(c['type']) for c in sa_inspect(self.engine).get_columns(table)}
+        cols = self._get_columns(table)
+        db_cols = {c['name']: str(c['type']) for c in cols}
         schema_map = schema_map or {
             c: ("INTEGER" if "int" in str(t).lower() else
                 "FLOAT" if "float" in str(t).lower() else
@@ -157,10 +266,9 @@ class SqlCon(FallbackExecutor):
 
     def check_tables(self, save_path: Optional[str] = None) -> Dict:
         """Inspect and optionally save schema."""
-        inspector = sa_inspect(self.engine)
         schema = {
-            t: {"columns": [{"name": c["name"], "type": str(c["type"])} for c in inspector.get_columns(t)]}
-            for t in inspector.get_table_names()
+            t: {"columns": [{"name": c["name"], "type": str(c["type"])} for c in cols]}
+            for t, cols in self._get_schema().items()
         }
         if save_path:
             with open(save_path, "w", encoding="utf-8") as f:
@@ -194,8 +302,10 @@ class SqlCon(FallbackExecutor):
         return {"missing_tables": missing, "extra_tables": extra, "column_diffs": diffs}
 
     def close(self):
-        """Dispose of engine resources."""
+        """Dispose of engine resources and flush the audit log."""
         self.engine.dispose()
+        self.close_raw()
+        self.audit_obj.close()
 
     def __enter__(self):
         return self
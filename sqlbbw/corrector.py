@@ -1,67 +1,118 @@
 """Data type correction and casting for database operations."""
 
+import collections
+import sys
+import numpy as np
 import pandas as pd
-import re
-from typing import Dict, List, Iterable, Any
+from typing import Dict, List, Iterable, Any, Tuple, Optional, Callable
 from sqlalchemy import inspect as sa_inspect
 from sqlalchemy.engine import Engine
-from .mappings import dtype_map, coercers, patterns
+from .mappings import dtype_map, coercers, _PATTERNS_ALT, _PREFILTERS, _TYPE_ORDER, _to_bool
 import logging
 
 logger = logging.getLogger(__name__)
 
+# DataCorrector keeps column metadata for at most this many tables
+_COL_CACHE_SIZE = 256
+
+# cast_df infers a column's type from at most this many non-null values
+_SAMPLE_N = 1024
+
 class DataCorrector:
     """Corrects data types to match database schema."""
     def __init__(self, engine: Engine, db: str):
         self.inspector = sa_inspect(engine)
         self.db = db.lower()
-        self.col_cache = {}  # Cache {table: {col: type}}
+        self.col_cache = collections.OrderedDict()  # LRU {table: {col: (type, base, coercer)}}
+
+    def col_meta(self, table: str) -> Dict[str, Tuple[str, str, Optional[Callable]]]:
+        """Return cached column metadata for a table, loading it on a miss."""
+        cache = self.col_cache
+        meta = cache.get(table)
+        if meta is None:
+            meta = cache[table] = self._load_col_meta(table)
+            if len(cache) > _COL_CACHE_SIZE:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(table)
+        return meta
+
+    def _load_col_meta(self, table: str) -> Dict[str, Tuple[str, str, Optional[Callable]]]:
+        """Read column types for a table and resolve each base type's coercer once."""
+        db_coercers = coercers.get(self.db, {})
+        meta = {}
+        for c in self.inspector.get_columns(table):
+            type_str = str(c['type']).upper()
+            base_type = type_str.split('(')[0]
+            meta[sys.intern(c['name'])] = (type_str, base_type, db_coercers.get(base_type))
+        return meta
+
+    def invalidate(self, table: Optional[str] = None):
+        """Forget cached column metadata for table, or for every table; call after DDL."""
+        if table is None:
+            self.col_cache.clear()
+        else:
+            self.col_cache.pop(table, None)
+        self.inspector.info_cache.clear()
 
     def cols(self, table: str) -> Dict[str, str]:
         """Get column types for a table."""
-        if table not in self.col_cache:
-            self.col_cache[table] = {c['name']: str(c['type']).upper() for c in self.inspector.get_columns(table)}
-        return self.col_cache[table]
+        return {name: m[0] for name, m in self.col_meta(table).items()}
 
     def fix_rows(self, table: str, rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Coerce row data to match table schema."""
-        meta = self.cols(table)
-        out = []
-        for row in rows:
-            corrected = {}
-            for key, value in row.items():
-                if key not in meta:
-                    continue
-                type_str = meta[key]
-                base_type = type_str.split('(')[0]
-                coercer = coercers.get(self.db, {}).get(base_type)
-                try:
-                    corrected[key] = None if value is None else coercer(pd.Series([value]), type_str)[0] if coercer else str(value)
-                except Exception as e:
-                    logger.warning(f'Coerce {key}={value} ({type_str}): {e}')
-                    corrected[key] = None
-            out.append(corrected)
-        return out
+        """Coerce row data to match table schema, one coercer call per column."""
+        meta = self.col_meta(table)
+        rows = list(rows)
+        keys = [k for k in dict.fromkeys(k for row in rows for k in row) if k in meta]
+        fixed = {}
+        for key in keys:
+            values = [row.get(key) for row in rows]
+            type_str, _, coercer = meta[key]
+            if not coercer:
+                fixed[key] = [None if v is None else str(v) for v in values]
+                continue
+            try:
+                coerced = coercer(pd.Series(values, dtype=object), type_str).tolist()
+                # a batch can null out values per-cell coercion would keep (e.g. one inferred
+                # datetime format for mixed strings), so retry those cells on their own
+                fixed[key] = [
+                    None if v is None else self._coerce_cell(key, v, type_str, coercer) if pd.isna(c) else c
+                    for v, c in zip(values, coerced)
+                ]
+            except Exception:
+                fixed[key] = [self._coerce_cell(key, v, type_str, coercer) for v in values]
+        return [{k: fixed[k][i] for k in row if k in meta} for i, row in enumerate(rows)]
+
+    @staticmethod
+    def _coerce_cell(key: str, value: Any, type_str: str, coercer) -> Any:
+        """Coerce one value; isolates the failing cells when a column batch fails."""
+        if value is None:
+            return None
+        try:
+            return coercer(pd.Series([value]), type_str)[0]
+        except Exception as e:
+            logger.warning(f'Coerce {key}={value} ({type_str}): {e}')
+            return None
 
     def fix_df(self, table: str, df: pd.DataFrame) -> pd.DataFrame:
         """Coerce DataFrame columns to match table schema."""
-        meta = self.cols(table)
-        out = df.copy()
-        for col in out.columns:
+        meta = self.col_meta(table)
+        new_cols = {}
+        for col in df.columns:
+            series = df[col]
             if col not in meta:
+                new_cols[col] = series
                 continue
-            type_str = meta[col]
-            base_type = type_str.split('(')[0]
-            coercer = coercers.get(self.db, {}).get(base_type)
+            type_str, _, coercer = meta[col]
             if coercer:
                 try:
-                    out[col] = coercer(out[col], type_str)
+                    new_cols[col] = coercer(series, type_str)
                 except Exception as e:
                     logger.warning(f'Coerce column {col} ({type_str}): {e}')
-                    out[col] = out[col].astype(str)
+                    new_cols[col] = series.astype(str)
             else:
-                out[col] = out[col].astype(str)
-        return out
+                new_cols[col] = series.astype(str)
+        return pd.DataFrame(new_cols, index=df.index, copy=False)
 
     def dtype_to_sql(self, dtype: str) -> str:
         """Map Pandas dtype to SQL type."""
@@ -79,46 +130,80 @@ class DataCorrector:
         """Get {col: pd_dtype} from table schema."""
         return {col: self.sql_to_dtype(t_str) for col, t_str in self.cols(table).items()}
 
+def _infer_type(col: pd.Series) -> Optional[str]:
+    """Return the first pattern type every sampled non-null value matches, or None."""
+    if pd.api.types.is_numeric_dtype(col) or pd.api.types.is_bool_dtype(col) or pd.api.types.is_datetime64_any_dtype(col):
+        return None
+    non_null = col.dropna()
+    if non_null.empty:
+        return None
+    sample = non_null.iloc[:_SAMPLE_N].astype(str).str.strip()  # only the sample is ever inspected
+    for dtype in _TYPE_ORDER:
+        pre = _PREFILTERS.get(dtype)
+        if pre and not all(map(pre, sample)):
+            continue
+        if sample.str.match(_PATTERNS_ALT[dtype]).all():
+            return dtype
+    return None
+
+def _to_datetime(col: pd.Series) -> pd.Series:
+    return pd.to_datetime(col, errors='coerce')
+
+def _epoch_to_datetime(col: pd.Series) -> pd.Series:
+    """Convert epoch numbers, picking the unit per value by magnitude: 16 digits us, 13 digits ms, else s."""
+    s = pd.to_numeric(col, errors='coerce')
+    units = np.select([s >= 1e15, s >= 1e12], ['us', 'ms'], default='s')
+    found = pd.unique(units)
+    if len(found) == 1:
+        return pd.to_datetime(s, unit=found[0], errors='coerce')
+    out = pd.Series(pd.NaT, index=s.index, dtype='datetime64[ns]')
+    for unit in found:
+        mask = units == unit
+        out[mask] = pd.to_datetime(s[mask], unit=unit, errors='coerce')
+    return out
+
+def _to_int(col: pd.Series) -> pd.Series:
+    return pd.to_numeric(col, errors='coerce').astype('Int64')
+
+def _to_float(col: pd.Series) -> pd.Series:
+    return pd.to_numeric(col, errors='coerce').astype('float64')
+
+def _to_string(col: pd.Series) -> pd.Series:
+    return col.astype('string')
+
+# Inferred type -> converter; types sharing a converter are cast together as one block
+_CASTS = {
+    'date': _to_datetime, 'timestamp': _to_datetime, 'time': _to_datetime,
+    'epochtime': _epoch_to_datetime, 'integer': _to_int, 'float': _to_float, 'boolean': _to_bool,
+}
+
 def cast_df(df: pd.DataFrame) -> pd.DataFrame:
     """Infer and cast DataFrame dtypes using regex patterns."""
+    groups = {}  # converter -> [(col, inferred type)]
     for col in df.columns:
-        if pd.api.types.is_numeric_dtype(df[col]) or pd.api.types.is_bool_dtype(df[col]) or pd.api.types.is_datetime64_any_dtype(df[col]):
-            continue
-        non_null = df[col].dropna().astype(str).str.strip()
-        if non_null.empty:
-            continue
-        sample = non_null  # Use all non-null values
-        matched_type = None
-        for dtype, regexes in patterns.items():
-            if all(any(re.match(regex, val) for regex in regexes) for val in sample):
-                matched_type = dtype
-                break
+        matched_type = _infer_type(df[col])
         if matched_type:
-            try:
-                if matched_type in ['date', 'timestamp', 'time']:
-                    df[col] = pd.to_datetime(df[col], errors='coerce')
-                elif matched_type == 'epochtime':
-                    # Try different units for epoch times
-                    s = pd.to_numeric(df[col], errors='coerce')
-                    if s.max() > 1e12:  # ms
-                        df[col] = pd.to_datetime(s, unit='ms', errors='coerce')
-                    elif s.max() > 1e15:  # us
-                        df[col] = pd.to_datetime(s, unit='us', errors='coerce')
-                    else:  # s
-                        df[col] = pd.to_datetime(s, unit='s', errors='coerce')
-                elif matched_type == 'integer':
-                    df[col] = pd.to_numeric(df[col], errors='coerce').astype('Int64')
-                elif matched_type == 'float':
-                    df[col] = pd.to_numeric(df[col], errors='coerce').astype('float64')
-                elif matched_type == 'boolean':
-                    def bool_map(x):
-                        if pd.isna(x):
-                            return pd.NA
-                        x_str = str(x).lower()
-                        return True if x_str in ['true', 'yes', 'y', '1'] else False if x_str in ['false', 'no', 'n', '0'] else pd.NA
-                    df[col] = df[col].apply(bool_map).astype('boolean')
-                else:
-                    df[col] = df[col].astype('string')
-            except Exception as e:
-                logger.warning(f"Error casting {col} to {matched_type}: {e}")
-    return df
\ No newline at end of file
+            groups.setdefault(_CASTS.get(matched_type, _to_string), []).append((col, matched_type))
+    for cast, members in groups.items():
+        cols = [c for c, _ in members]
+        try:
+            converted = df[cols].apply(cast)
+        except Exception:
+            converted = {}
+            for col, matched_type in members:  # isolate the failing column(s)
+                try:
+                    converted[col] = cast(df[col])
+                except Exception as e:
+                    logger.warning(f"Error casting {col} to {matched_type}: {e}")
+        ok = [col for col in cols if col in converted and _keeps_values(df[col], converted[col])]
+        if ok:
+            df[ok] = converted[ok] if isinstance(converted, pd.DataFrame) else pd.DataFrame({c: converted[c] for c in ok})
+    return df
+
+def _keeps_values(before: pd.Series, after: pd.Series) -> bool:
+    """True unless the cast nulled a value; inference only sees a sample, so later values may not fit."""
+    lost = after.isna() & before.notna()
+    if lost.any():
+        logger.debug(f"Keeping {before.name} uncast: {int(lost.sum())} value(s) do not fit the inferred type")
+        return False
+    return True
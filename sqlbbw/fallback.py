@@ -1,10 +1,15 @@
 """Fallback execution using raw database drivers."""
 
 import re
+import functools
 import sqlite3
+import threading
+import weakref
+from contextlib import closing, contextmanager
 import psycopg2
+import psycopg2.extras
 from sqlalchemy.engine.url import URL
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple, FrozenSet
 import logging
 
 logger = logging.getLogger(__name__)
@@ -29,6 +34,34 @@ except ImportError:
 
 _rx_pg = re.compile(r':([A-Za-z_]\w*)\b')
 
+@functools.lru_cache(maxsize=1024)
+def _pg_convert(sql: str) -> Tuple[str, FrozenSet[str]]:
+    """Return (sql with %(name)s placeholders, names it expects); memoized per SQL template."""
+    return _rx_pg.sub(r'%(\1)s', sql), frozenset(_rx_pg.findall(sql))
+
+def _close_conn(conn):
+    """Close a raw connection, logging rather than raising on failure."""
+    try:
+        conn.close()
+    except Exception as e:
+        logger.warning(f"Closing fallback connection failed: {e}")
+
+def _release(conns: set, lock: threading.Lock, conn):
+    """Unregister and close conn unless close_raw already did."""
+    with lock:
+        if conn not in conns:
+            return
+        conns.discard(conn)
+    _close_conn(conn)
+
+class _ConnHolder:
+    """Thread-local owner of one raw connection; closes it when the thread's locals are freed."""
+    __slots__ = ('conn', 'release', '__weakref__')
+
+    def __init__(self, conn, conns: set, lock: threading.Lock):
+        self.conn = conn
+        self.release = weakref.finalize(self, _release, conns, lock, conn)
+
 class FallbackExecutor:
     """Executes SQL using raw drivers as a fallback."""
     def __init__(self, url: URL):
@@ -36,103 +69,140 @@ class FallbackExecutor:
         self.db = url.drivername.split('+')[0]
         if self.db == 'postgres':
             self.db = 'postgresql'
+        self._local = threading.local()  # one _ConnHolder per thread, reused across calls
+        self._conns = set()  # every live thread's raw connection, so close_raw can reach them all
+        self._conns_lock = threading.Lock()
 
     def _pg_style(self, sql: str, params: Dict[str, Any]) -> str:
         """Convert :param to %(param)s for PostgreSQL."""
-        matched = set(_rx_pg.findall(sql))
-        missing = matched - set(params)
+        converted, matched = _pg_convert(sql)
+        missing = matched - params.keys()
         if missing:
-            raise ValueError(f"Missing parameters for PostgreSQL query: {missing}")
-        return _rx_pg.sub(r'%(\1)s', sql)
+            raise ValueError(f"Missing parameters for PostgreSQL query: {set(missing)}")
+        return converted
 
-    def _sqlite(self, sql: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Execute SQL on SQLite."""
-        with sqlite3.connect(self.url.database or ':memory:') as conn:
-            conn.execute('BEGIN')
+    def _connect(self):
+        """Open a new raw driver connection with autocommit off."""
+        if self.db == 'sqlite':
+            conn = sqlite3.connect(self.url.database or ':memory:', check_same_thread=False)  # close_raw may close it from another thread
+            conn.row_factory = sqlite3.Row
+            return conn
+        if self.db == 'postgresql':
+            conn = psycopg2.connect(
+                dbname=self.url.database, user=self.url.username, password=self.url.password,
+                host=self.url.host, port=self.url.port or 5432, sslmode='prefer'
+            )
+        elif self.db == 'oracle':
+            if not oracledb:
+                raise ImportError('oracledb or cx_Oracle required')
+            dsn = oracledb.makedsn(self.url.host, self.url.port or 1521, service_name=self.url.database or self.url.query.get('sid'))
+            conn = oracledb.connect(user=self.url.username, password=self.url.password, dsn=dsn)
+        elif self.db == 'mssql':
+            if not pyodbc:
+                raise ImportError('pyodbc required')
+            conn_str = f"DRIVER={{ODBC Driver 17 for SQL Server}};SERVER={self.url.host};DATABASE={self.url.database};UID={self.url.username};PWD={self.url.password}"
+            conn = pyodbc.connect(conn_str)
+        elif self.db == 'mysql':
+            if not mysql.connector:
+                raise ImportError('mysql.connector required')
+            conn = mysql.connector.connect(
+                database=self.url.database, user=self.url.username, password=self.url.password,
+                host=self.url.host, port=self.url.port or 3306
+            )
+        else:
+            raise NotImplementedError(f"Unsupported database: {self.db}")
+        conn.autocommit = False
+        return conn
+
+    def _get_conn(self):
+        """Return this thread's raw connection, connecting on first use."""
+        holder = getattr(self._local, 'holder', None)
+        if holder is None or holder.conn not in self._conns:  # not yet opened, or closed by close_raw
+            conn = self._connect()
+            with self._conns_lock:
+                self._conns.add(conn)
+            holder = self._local.holder = _ConnHolder(conn, self._conns, self._conns_lock)
+        return holder.conn
+
+    def _discard_conn(self):
+        """Close and forget this thread's raw connection."""
+        holder = getattr(self._local, 'holder', None)
+        self._local.holder = None
+        if holder is not None:
+            holder.release()
+
+    @contextmanager
+    def _tx(self):
+        """Yield the thread's connection; commit on success, roll back on error."""
+        conn = self._get_conn()
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
             try:
-                cur = conn.cursor()
-                cur.execute(sql, params)
-                rows = cur.fetchall() if cur.description else []
-                cols = [d[0] for d in cur.description] if cur.description else []
-                conn.commit()
-                return [dict(zip(cols, row)) for row in rows]
-            except Exception as e:
                 conn.rollback()
-                raise e
+            except Exception:
+                self._discard_conn()  # connection is unusable; reconnect next call
+            raise
+
+    def _sqlite(self, sql: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Execute SQL on SQLite."""
+        with self._tx() as conn, closing(conn.cursor()) as cur:
+            cur.execute(sql, params)
+            return list(map(dict, cur.fetchall())) if cur.description else []  # sqlite3.Row rows
 
     def _postgres(self, sql: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Execute SQL on PostgreSQL."""
         sql = self._pg_style(sql, params)
-        with psycopg2.connect(
-            dbname=self.url.database, user=self.url.username, password=self.url.password,
-            host=self.url.host, port=self.url.port or 5432, sslmode='prefer'
-        ) as conn:
-            conn.autocommit = False
-            try:
-                with conn.cursor() as cur:
-                    cur.execute(sql, params)
-                    rows = cur.fetchall() if cur.description else []
-                    cols = [d[0] for d in cur.description] if cur.description else []
-                    conn.commit()
-                    return [dict(zip(cols, row)) for row in rows]
-            except Exception as e:
-                conn.rollback()
-                raise e
+        with self._tx() as conn, closing(conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)) as cur:
+            cur.execute(sql, params)
+            return cur.fetchall() if cur.description else []
 
     def _oracle(self, sql: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Execute SQL on Oracle."""
-        if not oracledb:
-            raise ImportError('oracledb or cx_Oracle required')
-        dsn = oracledb.makedsn(self.url.host, self.url.port or 1521, service_name=self.url.database or self.url.query.get('sid'))
-        with oracledb.connect(user=self.url.username, password=self.url.password, dsn=dsn) as conn:
-            conn.autocommit = False
-            try:
-                with conn.cursor() as cur:
-                    cur.execute(sql, params)
-                    rows = cur.fetchall() if cur.description else []
-                    cols = [d[0] for d in cur.description] if cur.description else []
-                    conn.commit()
-                    return [dict(zip(cols, row)) for row in rows]
-            except Exception as e:
-                conn.rollback()
-                raise e
+        with self._tx() as conn, closing(conn.cursor()) as cur:
+            cur.execute(sql, params)
+            if not cur.description:
+                return []
+            cols = tuple(d[0] for d in cur.description)
+            cur.rowfactory = lambda *row: dict(zip(cols, row))
+            return cur.fetchall()
 
     def _mssql(self, sql: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Execute SQL on MSSQL."""
-        if not pyodbc:
-            raise ImportError('pyodbc required')
-        conn_str = f"DRIVER={{ODBC Driver 17 for SQL Server}};SERVER={self.url.host};DATABASE={self.url.database};UID={self.url.username};PWD={self.url.password}"
-        with pyodbc.connect(conn_str) as conn:
-            conn.autocommit = False
-            try:
-                with conn.cursor() as cur:
-                    cur.execute(sql, list(params.values()) if params else [])
-                    rows = cur.fetchall() if cur.description else []
-                    cols = [d[0] for d in cur.description] if cur.description else []
-                    conn.commit()
-                    return [dict(zip(cols, row)) for row in rows]
-            except Exception as e:
-                conn.rollback()
-                raise e
+        with self._tx() as conn, closing(conn.cursor()) as cur:
+            cur.execute(sql, list(params.values()) if params else [])
+            if not cur.description:
+                return []
+            keys = tuple(d[0] for d in cur.description)
+            return [dict(zip(keys, row)) for row in cur.fetchall()]
 
     def _mysql(self, sql: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Execute SQL on MySQL."""
-        if not mysql.connector:
-            raise ImportError('mysql.connector required')
-        with mysql.connector.connect(
-            database=self.url.database, user=self.url.username, password=self.url.password,
-            host=self.url.host, port=self.url.port or 3306
-        ) as conn:
-            conn.autocommit = False
-            try:
-                with conn.cursor(dictionary=True) as cur:
-                    cur.execute(sql, params)
-                    rows = cur.fetchall() if cur.description else []
-                    conn.commit()
-                    return rows
-            except Exception as e:
-                conn.rollback()
-                raise e
+        with self._tx() as conn, closing(conn.cursor(dictionary=True)) as cur:
+            cur.execute(sql, params)
+            return cur.fetchall() if cur.description else []
+
+    def _bind(self, sql: str, params: Dict[str, Any]):
+        """Adapt SQL and params to the driver's paramstyle."""
+        if self.db == 'postgresql':
+            return self._pg_style(sql, params), params
+        if self.db == 'mssql':
+            return sql, list(params.values()) if params else []
+        return sql, params
+
+    @contextmanager
+    def transaction(self):
+        """Run several statements on one fallback connection and cursor, committing once on exit."""
+        with self._tx() as conn, closing(conn.cursor()) as cur:
+            yield RawTransaction(self, cur)
+
+    def execute_raw_many(self, sql: str, rows: List[Dict[str, Any]]):
+        """Execute SQL for every row in one driver-level batch and transaction."""
+        if not rows:
+            return
+        with self.transaction() as tx:
+            tx.executemany(sql, rows)
 
     def execute_raw(self, sql: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Execute SQL using the appropriate driver."""
@@ -146,4 +216,37 @@ class FallbackExecutor:
             return self._mssql(sql, params)
         if self.db == 'mysql':
             return self._mysql(sql, params)
-        raise NotImplementedError(f"Unsupported database: {self.db}")
\ No newline at end of file
+        raise NotImplementedError(f"Unsupported database: {self.db}")
+
+    def close_raw(self):
+        """Close the fallback connections opened by every thread."""
+        self._local.holder = None
+        with self._conns_lock:
+            conns = list(self._conns)
+            self._conns.clear()  # holders share this set, so clear it in place
+        for conn in conns:
+            _close_conn(conn)
+
+class RawTransaction:
+    """Statements issued through FallbackExecutor.transaction() on its shared cursor."""
+    def __init__(self, executor: FallbackExecutor, cur):
+        self.executor = executor
+        self.cur = cur
+
+    def execute(self, sql: str, params: Optional[Dict[str, Any]] = None):
+        """Execute one statement inside the transaction."""
+        sql, bound = self.executor._bind(sql, params or {})
+        self.cur.execute(sql, bound)
+
+    def executemany(self, sql: str, rows: List[Dict[str, Any]]):
+        """Execute SQL once per row using the driver's batch API."""
+        if not rows:
+            return
+        db = self.executor.db
+        if db == 'postgresql':
+            psycopg2.extras.execute_batch(self.cur, self.executor._pg_style(sql, rows[0]), rows, page_size=1000)
+        elif db == 'mssql':
+            self.cur.fast_executemany = True
+            self.cur.executemany(sql, [list(r.values()) for r in rows])
+        else:
+            self.cur.executemany(sql, rows)
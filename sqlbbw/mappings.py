@@ -1,5 +1,7 @@
 """Database type mappings and regex patterns for type inference."""
 
+import re
+import pandas as pd
 from typing import Dict, List
 
 # Configurable default VARCHAR length
@@ -44,60 +46,99 @@ dtype_map = {
     }
 }
 
+_BOOL_STRINGS = {
+    'true': True, 't': True, 'yes': True, 'y': True, '1': True, '1.0': True,
+    'false': False, 'f': False, 'no': False, 'n': False, '0': False, '0.0': False,
+}
+
+def _to_bool(col: pd.Series, t_str: str = '') -> pd.Series:
+    """Vectorized bool coercion: booleans, 0/1 and common true/false strings; anything else is <NA>."""
+    return col.astype('string').str.strip().str.lower().map(_BOOL_STRINGS).astype('boolean')
+
+def _num_coerce(col: pd.Series, target: str) -> pd.Series:
+    """Cast to a numeric target; already-numeric columns of a compatible kind skip pd.to_numeric."""
+    kinds = 'iuf' if target.startswith('float') else 'iu'
+    if getattr(col.dtype, 'kind', 'O') in kinds:
+        return col.astype(target, copy=False)
+    return pd.to_numeric(col, errors='coerce').astype(target)
+
 # DB-specific coercion functions (SQL type -> Pandas Series coercer)
 coercers = {
     'oracle': {
         'VARCHAR2': lambda col, t_str: col.astype(str),
-        'NUMBER': lambda col, t_str: pd.to_numeric(col, errors='coerce').astype('Int64'),
-        'BINARY_FLOAT': lambda col, t_str: pd.to_numeric(col, errors='coerce').astype('float32'),
-        'BINARY_DOUBLE': lambda col, t_str: pd.to_numeric(col, errors='coerce').astype('float64'),
+        'NUMBER': lambda col, t_str: _num_coerce(col, 'Int64'),
+        'BINARY_FLOAT': lambda col, t_str: _num_coerce(col, 'float32'),
+        'BINARY_DOUBLE': lambda col, t_str: _num_coerce(col, 'float64'),
         'DATE': lambda col, t_str: pd.to_datetime(col, errors='coerce', dayfirst=True),
         'INTERVAL DAY TO SECOND': lambda col, t_str: pd.to_timedelta(col, errors='coerce'),
     },
     'mssql': {
         'VARCHAR': lambda col, t_str: col.astype(str),
-        'BIGINT': lambda col, t_str: pd.to_numeric(col, errors='coerce').astype('Int64'),
-        'REAL': lambda col, t_str: pd.to_numeric(col, errors='coerce').astype('float32'),
-        'FLOAT': lambda col, t_str: pd.to_numeric(col, errors='coerce').astype('float64'),
-        'BIT': lambda col, t_str: col.astype(bool, errors='ignore'),
+        'BIGINT': lambda col, t_str: _num_coerce(col, 'Int64'),
+        'REAL': lambda col, t_str: _num_coerce(col, 'float32'),
+        'FLOAT': lambda col, t_str: _num_coerce(col, 'float64'),
+        'BIT': _to_bool,
         'DATETIME': lambda col, t_str: pd.to_datetime(col, errors='coerce'),
     },
     'mysql': {
         'VARCHAR': lambda col, t_str: col.astype(str),
-        'BIGINT': lambda col, t_str: pd.to_numeric(col, errors='coerce').astype('Int64'),
-        'FLOAT': lambda col, t_str: pd.to_numeric(col, errors='coerce').astype('float32'),
-        'DOUBLE': lambda col, t_str: pd.to_numeric(col, errors='coerce').astype('float64'),
-        'TINYINT': lambda col, t_str: col.astype(bool, errors='ignore') if '(1)' in t_str else pd.to_numeric(col, errors='coerce').astype('int8'),
+        'BIGINT': lambda col, t_str: _num_coerce(col, 'Int64'),
+        'FLOAT': lambda col, t_str: _num_coerce(col, 'float32'),
+        'DOUBLE': lambda col, t_str: _num_coerce(col, 'float64'),
+        'TINYINT': lambda col, t_str: _to_bool(col) if '(1)' in t_str else _num_coerce(col, 'int8'),
         'DATETIME': lambda col, t_str: pd.to_datetime(col, errors='coerce'),
     },
     'postgresql': {
         'VARCHAR': lambda col, t_str: col.astype(str),
         'TEXT': lambda col, t_str: col.astype(str),
-        'BIGINT': lambda col, t_str: pd.to_numeric(col, errors='coerce').astype('Int64'),
-        'REAL': lambda col, t_str: pd.to_numeric(col, errors='coerce').astype('float32'),
-        'DOUBLE PRECISION': lambda col, t_str: pd.to_numeric(col, errors='coerce').astype('float64'),
-        'BOOLEAN': lambda col, t_str: col.astype(bool, errors='ignore'),
+        'BIGINT': lambda col, t_str: _num_coerce(col, 'Int64'),
+        'REAL': lambda col, t_str: _num_coerce(col, 'float32'),
+        'DOUBLE PRECISION': lambda col, t_str: _num_coerce(col, 'float64'),
+        'BOOLEAN': _to_bool,
         'TIMESTAMP': lambda col, t_str: pd.to_datetime(col, errors='coerce'),
         'INTERVAL': lambda col, t_str: pd.to_timedelta(col, errors='coerce'),
     },
     'sqlite': {
         'TEXT': lambda col, t_str: col.astype(str),
-        'INTEGER': lambda col, t_str: pd.to_numeric(col, errors='coerce').astype('Int64'),
-        'REAL': lambda col, t_str: pd.to_numeric(col, errors='coerce').astype('float64'),
+        'INTEGER': lambda col, t_str: _num_coerce(col, 'Int64'),
+        'REAL': lambda col, t_str: _num_coerce(col, 'float64'),
     }
 }
 
 # Regex patterns for type inference
-patterns = {
+_raw_patterns = {
     'epochtime': [r'^\d{10}(\.\d+)?$', r'^\d{13}$', r'^\d{16}$'],  # Added ms, us
     'date': [r'^\d{4}-\d{2}-\d{2}$', r'^\d{2}/\d{2}/\d{4}$', r'^\d{2}-\d{2}-\d{4}$', r'^\d{1,2}-\w{3}-\d{4}$', r'^\w{3}\s+\d{1,2},?\s+\d{4}$'],
     'time': [r'^\d{1,2}:\d{2}(:\d{2})?(\s*[AP]M)?$', r'^\d{2}:\d{2}:\d{2}\.\d{3}$'],
     'timestamp': [r'^\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}(\.\d+)?$', r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(\.\d+)?Z?$'],
     'integer': [r'^-?\d+$'],
     'float': [r'^-?\d*\.\d+$', r'^-?\d+\.?\d*[eE][+-]?\d+$'],
-    'boolean': [r'(?i)^(true|false|yes|no|y|n|0|1)$'],
+    'boolean': [r'^(?i:true|false|yes|no|y|n|0|1)$'],
     'uuid': [r'^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$'],
     'email': [r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'],
     'url': [r'^https?://[^\s]+$'],
     'json': [r'^\{.*\}$', r'^\[.*\]$']
-}
\ No newline at end of file
+}
+
+# Compiled once at import
+_PATTERNS_COMPILED = {k: [re.compile(r) for r in v] for k, v in _raw_patterns.items()}
+patterns = _PATTERNS_COMPILED
+# One alternation per type so cast_df can test a whole column with Series.str.match
+_PATTERNS_ALT = {k: re.compile('|'.join(f'(?:{r})' for r in v)) for k, v in _raw_patterns.items()}
+# cast_df tries types in this order and keeps the first that matches every sampled value
+_TYPE_ORDER = tuple(_raw_patterns)
+
+# Cheap necessary conditions per inferred type; a sample failing one skips that type's regexes
+_PREFILTERS = {
+    'epochtime': lambda s: len(s) >= 10 and s[0].isdigit(),
+    'date': lambda s: len(s) >= 8 and s[-1].isdigit(),
+    'time': lambda s: ':' in s,
+    'timestamp': lambda s: len(s) >= 19 and s[0].isdigit(),
+    'integer': lambda s: s[:1].isdigit() or s[:1] == '-',
+    'float': lambda s: s[:1].isdigit() or s[:1] in ('-', '.'),
+    'boolean': lambda s: 0 < len(s) <= 5,
+    'uuid': lambda s: len(s) == 36 and s[8] == '-',
+    'email': lambda s: '@' in s,
+    'url': lambda s: s.startswith(('http://', 'https://')),
+    'json': lambda s: s[:1] in ('{', '['),
+}
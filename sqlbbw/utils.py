@@ -1,15 +1,70 @@
 """Utility functions for database operations."""
 
+from __future__ import annotations
+
+import functools
 import pandas as pd
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple, TYPE_CHECKING
 from sqlalchemy import text
 from sqlalchemy.exc import OperationalError, InterfaceError
 from .corrector import cast_df
-from .con import SqlCon
+if TYPE_CHECKING:
+    from .conn import SqlCon
 import logging
 
 logger = logging.getLogger(__name__)
 
+@functools.lru_cache(maxsize=256)
+def _build_upsert(db: str, table: str, cols: Tuple[str, ...], key_cols: Tuple[str, ...], on_conflict: str) -> str:
+    """Build upsert SQL; memoized since ingest loops repeat the same table/columns."""
+    ph = ','.join(f':{c}' for c in cols)
+    insert_sql = f'INSERT INTO {table} ({",".join(cols)}) VALUES ({ph})'
+    if db == 'postgresql':
+        conflict = ','.join(key_cols)
+        updates = ','.join(f"{c}=EXCLUDED.{c}" for c in cols if c not in key_cols)
+        return f"{insert_sql} ON CONFLICT ({conflict}) DO UPDATE SET {updates}" if on_conflict == 'update' else f"{insert_sql} ON CONFLICT ({conflict}) DO NOTHING"
+    elif db == 'sqlite':
+        updates = ','.join(f"{c}=EXCLUDED.{c}" for c in cols if c not in key_cols)
+        return f"{insert_sql} ON CONFLICT ({','.join(key_cols)}) DO UPDATE SET {updates}" if on_conflict == 'update' else f"{insert_sql} ON CONFLICT ({','.join(key_cols)}) DO NOTHING"
+    elif db == 'oracle':
+        key_cond = ' AND '.join(f"t.{c} = s.{c}" for c in key_cols)
+        merge_sql = f"MERGE INTO {table} t USING (SELECT {','.join(f':{c} {c}' for c in cols)} FROM dual) s ON ({key_cond})"
+        if on_conflict == 'update':
+            merge_sql += f" WHEN MATCHED THEN UPDATE SET {','.join(f't.{c}=s.{c}' for c in cols if c not in key_cols)}"
+        merge_sql += f" WHEN NOT MATCHED THEN INSERT ({','.join(cols)}) VALUES ({','.join(f's.{c}' for c in cols)})"
+        return merge_sql
+    elif db == 'mysql':
+        updates = ','.join(f"{c}=VALUES({c})" for c in cols)
+        return f"{insert_sql} ON DUPLICATE KEY UPDATE {updates}" if on_conflict == 'update' else insert_sql
+    elif db == 'mssql':
+        key_cond = ' AND '.join(f"t.{c} = s.{c}" for c in key_cols)
+        merge_sql = f"MERGE INTO {table} t USING (VALUES ({ph})) s ({','.join(cols)}) ON ({key_cond})"
+        if on_conflict == 'update':
+            merge_sql += f" WHEN MATCHED THEN UPDATE SET {','.join(f't.{c}=s.{c}' for c in cols if c not in key_cols)}"
+        merge_sql += f" WHEN NOT MATCHED THEN INSERT ({','.join(cols)}) VALUES ({','.join(f's.{c}' for c in cols)})"
+        return merge_sql
+    raise NotImplementedError(f"Upsert not supported for {db}")
+
+@functools.lru_cache(maxsize=256)
+def _build_insert(table: str, cols: Tuple[str, ...]) -> str:
+    """Build a single-row named-param INSERT; memoized per (table, columns)."""
+    return f'INSERT INTO {table} ({",".join(cols)}) VALUES ({",".join(f":{c}" for c in cols)})'
+
+@functools.lru_cache(maxsize=256)
+def _build_alter(db: str, table: str, col: str, new_type: str, forced: bool) -> str:
+    """Build ALTER TABLE SQL for one column."""
+    if db == 'sqlite':
+        raise NotImplementedError("Forced column type alteration not supported in SQLite")
+    elif db == 'postgresql':
+        return f"ALTER TABLE {table} ALTER COLUMN {col} TYPE {new_type} USING {col}::{new_type}" if forced else f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {col} {new_type}"
+    elif db == 'oracle':
+        return f"ALTER TABLE {table} MODIFY {col} {new_type}" if forced else f"ALTER TABLE {table} ADD ({col} {new_type})"
+    elif db == 'mysql':
+        return f"ALTER TABLE {table} MODIFY COLUMN {col} {new_type}" if forced else f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {col} {new_type}"
+    elif db == 'mssql':
+        return f"ALTER TABLE {table} ALTER COLUMN {col} {new_type}" if forced else f"ALTER TABLE {table} ADD {col} {new_type}"
+    raise NotImplementedError(f"Alter not supported for {db}")
+
 class DbHandler:
     """Strategy for DB-specific SQL generation."""
     def __init__(self, db: str):
@@ -17,47 +72,11 @@ class DbHandler:
 
     def upsert_sql(self, table: str, cols: List[str], key_cols: List[str], on_conflict: str) -> str:
         """Generate upsert SQL for the database."""
-        ph = ','.join(f':{c}' for c in cols)
-        insert_sql = f'INSERT INTO {table} ({",".join(cols)}) VALUES ({ph})'
-        if self.db == 'postgresql':
-            conflict = ','.join(key_cols)
-            updates = ','.join(f"{c}=EXCLUDED.{c}" for c in cols if c not in key_cols)
-            return f"{insert_sql} ON CONFLICT ({conflict}) DO UPDATE SET {updates}" if on_conflict == 'update' else f"{insert_sql} ON CONFLICT ({conflict}) DO NOTHING"
-        elif self.db == 'sqlite':
-            updates = ','.join(f"{c}=EXCLUDED.{c}" for c in cols if c not in key_cols)
-            return f"{insert_sql} ON CONFLICT ({','.join(key_cols)}) DO UPDATE SET {updates}" if on_conflict == 'update' else f"{insert_sql} ON CONFLICT ({','.join(key_cols)}) DO NOTHING"
-        elif self.db == 'oracle':
-            key_cond = ' AND '.join(f"t.{c} = s.{c}" for c in key_cols)
-            merge_sql = f"MERGE INTO {table} t USING (SELECT {','.join(f':{c} {c}' for c in cols)} FROM dual) s ON ({key_cond})"
-            if on_conflict == 'update':
-                merge_sql += f" WHEN MATCHED THEN UPDATE SET {','.join(f't.{c}=s.{c}' for c in cols if c not in key_cols)}"
-            merge_sql += f" WHEN NOT MATCHED THEN INSERT ({','.join(cols)}) VALUES ({','.join(f's.{c}' for c in cols)})"
-            return merge_sql
-        elif self.db == 'mysql':
-            updates = ','.join(f"{c}=VALUES({c})" for c in cols)
-            return f"{insert_sql} ON DUPLICATE KEY UPDATE {updates}" if on_conflict == 'update' else insert_sql
-        elif self.db == 'mssql':
-            key_cond = ' AND '.join(f"t.{c} = s.{c}" for c in key_cols)
-            merge_sql = f"MERGE INTO {table} t USING (VALUES ({ph})) s ({','.join(cols)}) ON ({key_cond})"
-            if on_conflict == 'update':
-                merge_sql += f" WHEN MATCHED THEN UPDATE SET {','.join(f't.{c}=s.{c}' for c in cols if c not in key_cols)}"
-            merge_sql += f" WHEN NOT MATCHED THEN INSERT ({','.join(cols)}) VALUES ({','.join(f's.{c}' for c in cols)})"
-            return merge_sql
-        raise NotImplementedError(f"Upsert not supported for {self.db}")
+        return _build_upsert(self.db, table, tuple(cols), tuple(key_cols), on_conflict)
 
     def alter_column_sql(self, table: str, col: str, new_type: str, forced: bool) -> str:
         """Generate ALTER TABLE SQL for column type change."""
-        if self.db == 'sqlite':
-            raise NotImplementedError("Forced column type alteration not supported in SQLite")
-        elif self.db == 'postgresql':
-            return f"ALTER TABLE {table} ALTER COLUMN {col} TYPE {new_type} USING {col}::{new_type}" if forced else f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {col} {new_type}"
-        elif self.db == 'oracle':
-            return f"ALTER TABLE {table} MODIFY {col} {new_type}" if forced else f"ALTER TABLE {table} ADD ({col} {new_type})"
-        elif self.db == 'mysql':
-            return f"ALTER TABLE {table} MODIFY COLUMN {col} {new_type}" if forced else f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {col} {new_type}"
-        elif self.db == 'mssql':
-            return f"ALTER TABLE {table} ALTER COLUMN {col} {new_type}" if forced else f"ALTER TABLE {table} ADD {col} {new_type}"
-        raise NotImplementedError(f"Alter not supported for {self.db}")
+        return _build_alter(self.db, table, col, new_type, forced)
 
 def create_table_schema(con: SqlCon, table: str, df: pd.DataFrame, execute: bool = True) -> str:
     """Create table schema from DataFrame."""
@@ -67,6 +86,7 @@ def create_table_schema(con: SqlCon, table: str, df: pd.DataFrame, execute: bool
     if execute:
         logger.debug(f"Executing: {sql}")
         con.execute(sql)
+        con.invalidate_schema(table)
     return sql
 
 def map_alter_filter_column(con: SqlCon, table: str, col: str, new_type: str):
@@ -74,20 +94,29 @@ def map_alter_filter_column(con: SqlCon, table: str, col: str, new_type: str):
     handler = DbHandler(con.db)
     sql = handler.alter_column_sql(table, col, new_type, forced=False)
     con.execute(sql)
+    con.invalidate_schema(table)
 
 def map_alter_forced(con: SqlCon, table: str, col: str, new_type: str):
     """Force change column type."""
     handler = DbHandler(con.db)
     sql = handler.alter_column_sql(table, col, new_type, forced=True)
     con.execute(sql)
+    con.invalidate_schema(table)
+
+def map_alter_columns(con: SqlCon, table: str, columns: Dict[str, str], forced: bool):
+    """Apply several column alterations in one transaction."""
+    if not columns:
+        return
+    handler = DbHandler(con.db)
+    stmts = [handler.alter_column_sql(table, col, new_type, forced=forced) for col, new_type in columns.items()]
+    con.execute_ddl('; '.join(stmts), stmts=stmts)
+    con.invalidate_schema(table)
 
 def insert_batch(con: SqlCon, table: str, rows: List[Dict[str, Any]]):
     """Batch insert rows."""
     if not rows:
         return
-    cols = list(rows[0].keys())
-    ph = ','.join(f':{c}' for c in cols)
-    sql = f'INSERT INTO {table} ({",".join(cols)}) VALUES ({ph})'
+    sql = _build_insert(table, tuple(rows[0]))
     con._log(sql, f'{len(rows)} rows')
     try:
         with con.engine.begin() as c:
@@ -95,8 +124,36 @@ def insert_batch(con: SqlCon, table: str, rows: List[Dict[str, Any]]):
     except (OperationalError, InterfaceError) as e:
         if con.auto_fb:
             logger.warning(f"Fallback insert: {e}")
-            for row in rows:
-                con.execute_raw(sql, row)
+            con.execute_raw_many(sql, rows)
+        else:
+            raise
+
+_POSITIONAL_PH = {'qmark': '?', 'format': '%s', 'pyformat': '%s'}
+
+def insert_batch_from_df(con: SqlCon, table: str, df: pd.DataFrame):
+    """Batch insert DataFrame rows as positional tuples."""
+    if df.empty:
+        return
+    cols = [str(c) for c in df.columns]
+    paramstyle = con.engine.dialect.paramstyle
+    if paramstyle == 'numeric':
+        ph = ','.join(f':{i}' for i in range(1, len(cols) + 1))
+    elif paramstyle in _POSITIONAL_PH:
+        ph = ','.join([_POSITIONAL_PH[paramstyle]] * len(cols))
+    else:
+        insert_batch(con, table, df.to_dict('records'))
+        return
+    sql = f'INSERT INTO {table} ({",".join(cols)}) VALUES ({ph})'
+    # box numpy scalars to native Python values and NA to None; drivers reject or mis-store numpy types
+    rows = list(map(tuple, df.astype(object).where(df.notna(), None).to_numpy().tolist()))
+    con._log(sql, f'{len(rows)} rows')
+    try:
+        with con.engine.begin() as c:
+            c.exec_driver_sql(sql, rows)
+    except (OperationalError, InterfaceError) as e:
+        if con.auto_fb:
+            logger.warning(f"Fallback insert: {e}")
+            con.execute_raw_many(_build_insert(table, tuple(cols)), [dict(zip(cols, row)) for row in rows])
         else:
             raise
 
@@ -104,11 +161,10 @@ def upsert(con: SqlCon, table: str, rows: List[Dict[str, Any]], key_cols: List[s
     """Upsert rows with conflict handling."""
     if not rows:
         return
-    cols = list(rows[0].keys())
+    cols = tuple(rows[0])
     if not all(k in cols for k in key_cols):
         raise ValueError(f"Key columns {key_cols} not in row data")
-    handler = DbHandler(con.db)
-    sql = handler.upsert_sql(table, cols, key_cols, on_conflict)
+    sql = _build_upsert(con.db.lower(), table, cols, tuple(key_cols), on_conflict)
     con._log(sql, f'{len(rows)} rows')
     try:
         with con.engine.begin() as c:
@@ -116,7 +172,6 @@ def upsert(con: SqlCon, table: str, rows: List[Dict[str, Any]], key_cols: List[s
     except (OperationalError, InterfaceError) as e:
         if con.auto_fb:
             logger.warning(f"Fallback upsert: {e}")
-            for row in rows:
-                con.execute_raw(sql, row)
+            con.execute_raw_many(sql, rows)
         else:
             raise
\ No newline at end of file
@@ -0,0 +1,13 @@
+"""pytest plugin (loaded from pytest.ini) that keeps pytest from importing the repo-root package."""
+
+from pathlib import Path
+
+import pytest
+
+_ROOT = Path(__file__).parent.parent
+
+
+def pytest_collect_directory(path, parent):
+    """Collect the repo root as a plain directory; as a Package its __init__ would import the whole tree."""
+    if path == _ROOT:
+        return pytest.Dir.from_parent(parent, path=path)
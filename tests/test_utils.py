@@ -0,0 +1,18 @@
+"""Tests for sqlbbw.utils."""
+
+import sqlite3
+
+import pandas as pd
+
+from sqlbbw import SqlCon
+
+
+def test_append_round_trips_native_ints(tmp_path):
+    db = tmp_path / 'data.db'
+    with sqlite3.connect(db) as raw:
+        raw.execute('CREATE TABLE t (id INTEGER PRIMARY KEY, a INTEGER, b REAL, c TEXT)')
+    with SqlCon(f'sqlite:///{db}', audit_db=str(tmp_path / 'audit.db')) as con:
+        con.append('t', pd.DataFrame({'id': [1, 2], 'a': [1, 2], 'b': [0.5, None], 'c': ['x', 'y']}))
+        assert con.execute("SELECT typeof(a) AS t FROM t") == [{'t': 'integer'}, {'t': 'integer'}]
+        assert con.execute("SELECT id, b FROM t WHERE a = 1") == [{'id': 1, 'b': 0.5}]
+        assert con.execute("SELECT b FROM t WHERE a = 2") == [{'b': None}]